@@ -1,10 +1,18 @@
 """
-Application Configuration - Pydantic Settings
+Application Configuration - Environment Settings
 
-This module centralizes ALL configuration in one place using Pydantic Settings.
+This module centralizes ALL configuration in one place using a plain
+frozen dataclass populated from environment variables.
 
-WHY USE PYDANTIC SETTINGS?
-==========================
+WHY A DATACLASS INSTEAD OF PYDANTIC SETTINGS?
+=============================================
+pydantic-settings builds a full validation schema when the class is
+imported. This module is imported by almost everything (database, routes,
+utilities), so every uvicorn boot, worker fork and test run paid that cost.
+A dataclass + os.environ gives us the same behaviour with no schema build.
+
+WHAT WE KEEP
+============
 1. VALIDATION AT STARTUP
    - If a required env var is missing, the app won't start
    - You find out immediately, not at 3am when a customer tries to pay
@@ -23,7 +31,7 @@ WHY USE PYDANTIC SETTINGS?
 
 HOW IT WORKS
 ============
-Pydantic Settings automatically reads from:
+get_settings() reads from:
 1. Environment variables (highest priority)
 2. .env file (if present)
 3. Default values in this file (lowest priority)
@@ -37,12 +45,16 @@ USAGE
     debug_mode = settings.DEBUG
 """
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import os
+from dataclasses import MISSING, dataclass, fields
 from functools import lru_cache
 from typing import Optional
 
+from dotenv import load_dotenv
 
-class Settings(BaseSettings):
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """
     Application settings loaded from environment variables.
     
@@ -72,6 +84,44 @@ class Settings(BaseSettings):
     # How long access tokens are valid (in minutes)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # How long (in seconds) a verified token and the authenticated user's row
+    # are reused between requests before being checked again. Role changes made
+    # through the admin API take effect immediately in the worker that made
+    # them; other workers catch up within this window. 0 disables the cache.
+    USER_CACHE_TTL_SECONDS: int = 30
+    
+    # Maximum entries in each of the verified-token and user caches (LRU)
+    USER_CACHE_MAX_SIZE: int = 10000
+    
+    # Forgot-password / resend-verification send at most one email per
+    # address within this many seconds; repeats get the usual response but
+    # skip the database lookup and the email. 0 disables the throttle.
+    EMAIL_REQUEST_COOLDOWN_SECONDS: int = 60
+    
+    # =========================================================================
+    # Database Connection Pool
+    # =========================================================================
+    # Persistent connections kept open, plus extra ones allowed under bursts.
+    # Size these to (workers x expected concurrent requests per worker) and
+    # keep the total below PostgreSQL's max_connections.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    
+    # Recycle connections older than this many seconds (avoids server-side
+    # idle timeouts killing connections we still think are alive)
+    DB_POOL_RECYCLE: int = 1800
+    
+    # Ping each connection as it's checked out of the pool. Costs one round
+    # trip per request but turns a database restart into reconnects instead
+    # of errors. On a stable network it can be turned off: TCP keepalives
+    # (below) and DB_POOL_RECYCLE still weed out dead idle connections.
+    DB_POOL_PRE_PING: bool = True
+    
+    # Seconds a pooled connection may sit idle before the OS starts sending
+    # TCP keepalive probes, so connections silently dropped by a firewall or
+    # NAT are detected in the background rather than on the next query
+    DB_TCP_KEEPALIVE_IDLE: int = 60
+    
     # =========================================================================
     # Application Settings
     # =========================================================================
@@ -85,6 +135,12 @@ class Settings(BaseSettings):
     # Frontend URL (for CORS, email links, payment redirects)
     FRONTEND_URL: str = "http://localhost:5173"
     
+    # Create missing tables on app startup (SQLModel.metadata.create_all).
+    # Off by default: the schema is managed by `alembic upgrade head`, and
+    # doing this in every worker on every restart is wasted round-trips.
+    # For a quick local database without Alembic, run `python -m app.init_db`.
+    RUN_DB_INIT: bool = False
+    
     # =========================================================================
     # Superadmin (Initial Setup)
     # =========================================================================
@@ -121,18 +177,50 @@ class Settings(BaseSettings):
     
     # Webhook signing secret from `stripe listen` or Stripe Dashboard
     STRIPE_WEBHOOK_SECRET: Optional[str] = None  # Optional for local dev
+
+
+# =============================================================================
+# Environment Parsing Helpers
+# =============================================================================
+# Environment variables are always strings, so we convert them explicitly.
+# Booleans accept the same spellings pydantic did: "true", "1", "yes", "on".
+
+_TRUE_VALUES = {"1", "true", "t", "yes", "y", "on"}
+_FALSE_VALUES = {"0", "false", "f", "no", "n", "off", ""}
+
+# Guard so the .env file is only read from disk once per process
+_loaded = False
+
+
+def _as_bool(name: str, value: str) -> bool:
+    """Convert an environment string like "true" or "0" to a bool."""
+    normalized = value.strip().lower()
+    if normalized in _TRUE_VALUES:
+        return True
+    if normalized in _FALSE_VALUES:
+        return False
+    raise RuntimeError(f"Invalid boolean value for {name}: {value!r}")
+
+
+def _as_int(name: str, value: str) -> int:
+    """Convert an environment string like "30" to an int."""
+    try:
+        return int(value.strip())
+    except ValueError:
+        raise RuntimeError(f"Invalid integer value for {name}: {value!r}") from None
+
+
+def _load_env_file() -> None:
+    """
+    Load the .env file into os.environ (only once).
     
-    # =========================================================================
-    # Pydantic Settings Configuration
-    # =========================================================================
-    model_config = SettingsConfigDict(
-        # Load from .env file in the backend directory
-        env_file=".env",
-        # .env file is optional (we might have env vars set directly)
-        env_file_encoding="utf-8",
-        # Don't fail if .env file doesn't exist
-        extra="ignore",  # Ignore extra env vars not defined here
-    )
+    Real environment variables win over .env values (override=False),
+    which matches the old pydantic-settings priority order.
+    """
+    global _loaded
+    if not _loaded:
+        load_dotenv(".env", encoding="utf-8", override=False)
+        _loaded = True
 
 
 # =============================================================================
@@ -153,11 +241,42 @@ def get_settings() -> Settings:
     Subsequent calls: Returns cached settings instantly
     
     Raises:
-        ValidationError: If required settings are missing or invalid
+        RuntimeError: If required settings are missing or invalid
     """
-    return Settings()
+    _load_env_file()
+    
+    values = {}
+    missing = []
+    for field in fields(Settings):
+        raw = os.environ.get(field.name)
+        if raw is None:
+            # Not set anywhere: fall back to the dataclass default (if any)
+            if field.default is MISSING:
+                missing.append(field.name)
+            continue
+        if field.type is bool:
+            values[field.name] = _as_bool(field.name, raw)
+        elif field.type is int:
+            values[field.name] = _as_int(field.name, raw)
+        else:
+            values[field.name] = raw
+    
+    if missing:
+        raise RuntimeError(f"Missing required environment variables: {', '.join(missing)}")
+    
+    return Settings(**values)
 
 
-# Create a global settings instance for easy importing
+# Global settings instance for easy importing
 # Usage: from app.config import settings
-settings = get_settings()
+#
+# The instance is created lazily (PEP 562 module __getattr__): importing
+# app.config costs nothing, and the env is only read the first time
+# something actually asks for `settings`. After that it is cached as a
+# normal module global, so later lookups never reach __getattr__.
+def __getattr__(name: str):
+    if name == "settings":
+        value = get_settings()
+        globals()["settings"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
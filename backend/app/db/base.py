@@ -1,9 +1,34 @@
+"""
+Model Registry Module
+
+Alembic and create_all() need every table model registered on
+SQLModel.metadata, but nothing else does - routes import the models they
+use directly. So instead of importing every model at module load, we list
+the model modules here and import them on demand.
+"""
+
+import importlib
 
 from sqlmodel import SQLModel
-from ..models.user import User
-from ..models.restaurant import Restaurant
-from ..models.membership import Membership
-from ..models.recipe import Recipe
-from ..models.order import Order, OrderItem
 
-__all__ = ["SQLModel", "User", "Restaurant", "Membership", "Recipe", "Order", "OrderItem"]
+# Every module that defines a table=True model
+_MODEL_MODULES = (
+    "app.models.user",
+    "app.models.restaurant",
+    "app.models.membership",
+    "app.models.recipe",
+    "app.models.order",
+    "app.models.webhook_event",
+)
+
+
+def ensure_models_loaded() -> None:
+    """
+    Import all model modules so their tables are registered on
+    SQLModel.metadata. Safe to call more than once (imports are cached).
+    """
+    for module_name in _MODEL_MODULES:
+        importlib.import_module(module_name)
+
+
+__all__ = ["SQLModel", "ensure_models_loaded"]
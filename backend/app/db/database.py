@@ -6,16 +6,63 @@ The engine is the core interface to the database - it manages
 the connection pool and executes all database operations.
 """
 
-from sqlmodel import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session, create_engine
 
 # Import centralized settings
 # This validates DATABASE_URL exists at startup (not at 3am when something breaks!)
 from ..config import settings
 
+# Snapshot the settings we need once at import time
+_DATABASE_URL = settings.DATABASE_URL
+_ECHO = settings.DEBUG  # Only log SQL in debug mode
+
+# Connection pool tuning (QueuePool defaults of 5 + 10 overflow are too
+# small once several requests/websockets hit the database at the same time)
+# - pool_pre_ping: test a connection before using it, so a DB restart
+#   doesn't surface as a burst of 500 errors (DB_POOL_PRE_PING can turn
+#   this off to save the round trip per checkout)
+# - keepalives: libpq's TCP keepalive probes check idle pooled connections
+#   in the background (in the kernel - no thread or task of ours), so a
+#   connection dropped by a firewall/NAT is noticed before it's reused
+# - pool_use_lifo: reuse the most recently returned connection first, which
+#   keeps a small set of connections warm and lets idle extras time out
+# SQLite (used by tests/local experiments) has its own pool types that
+# don't accept these options.
+_POOL_KWARGS = {}
+if make_url(_DATABASE_URL).get_backend_name() != "sqlite":
+    _POOL_KWARGS = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": True,
+        "connect_args": {
+            "keepalives": 1,
+            "keepalives_idle": settings.DB_TCP_KEEPALIVE_IDLE,
+            "keepalives_interval": 10,
+            "keepalives_count": 3,
+        },
+    }
+
 # Create the SQLAlchemy engine - this is the starting point for all DB operations
 # - echo: Logs all SQL statements (DEBUG mode = helpful, production = too noisy)
 # - The engine manages a pool of database connections for efficiency
 engine = create_engine(
-    settings.DATABASE_URL, 
-    echo=settings.DEBUG  # Only log SQL in debug mode
+    _DATABASE_URL, 
+    echo=_ECHO,
+    **_POOL_KWARGS
+)
+
+# Session factory - configured once, reused for every request
+# - expire_on_commit=False: objects stay usable after commit() without
+#   an extra SELECT to reload them
+# - autoflush=False: changes are only sent to the DB on commit()/flush(),
+#   not before every query
+SessionLocal = sessionmaker(
+    bind=engine,
+    class_=Session,
+    expire_on_commit=False,
+    autoflush=False,
 )
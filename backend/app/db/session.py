@@ -9,13 +9,12 @@ Architecture:
     FastAPI Route
          │
          ▼
-    get_session() ──► Creates Session ──► Executes queries ──► Auto-closes
+    get_session() ──► SessionLocal() ──► Executes queries ──► Auto-closes
          │
          └── Injected via: Depends(get_session)
 """
 
-from sqlmodel import Session
-from .database import engine
+from .database import SessionLocal, engine
 
 
 def get_session():
@@ -34,6 +33,9 @@ def get_session():
     
     The 'with' statement ensures the session is properly closed,
     and any uncommitted changes are rolled back if an error occurs.
+    
+    Sessions come from the shared SessionLocal factory (see database.py),
+    so the session configuration is built once rather than per request.
     """
-    with Session(engine) as session:
+    with SessionLocal() as session:
         yield session
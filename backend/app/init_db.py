@@ -0,0 +1,26 @@
+"""
+One-shot database initialisation.
+
+Creates any missing tables straight from the SQLModel models. Production
+schemas are managed by Alembic (`alembic upgrade head`); this is a
+shortcut for throwaway local databases.
+
+Usage (from the backend directory):
+    python -m app.init_db
+"""
+
+from sqlmodel import SQLModel
+
+from .db.base import ensure_models_loaded
+from .db.database import engine
+
+
+def init_db() -> None:
+    """Create all tables that don't exist yet."""
+    ensure_models_loaded()
+    SQLModel.metadata.create_all(engine)
+
+
+if __name__ == "__main__":
+    init_db()
+    print("Database tables created")
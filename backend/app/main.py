@@ -1,25 +1,101 @@
 # Lifespan event for database initialization
-from fastapi import FastAPI
-from sqlmodel import SQLModel, Session, select
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
 from .db.database import engine
+from .init_db import init_db
+from .config import settings
 from .routes import recipe_routes, restaurant_routes, auth_routes, admin_routes, upload_routes, order_routes, websocket_routes, payment_routes
 from fastapi.middleware.cors import CORSMiddleware
 
-# Define lifespan event to create database tables on startup
+# Settings used by middleware, bound once at import
+_FRONTEND_URL = settings.FRONTEND_URL
+
+# Readiness probe query and response bodies, built once instead of on every probe.
+# (We keep the encoded bytes, not Response objects: middleware such as CORS
+# edits a response's header list in place, so Response instances can't be shared.)
+_HEALTH_STMT = text("SELECT 1")
+_READY_BODY = b'{"status":"ready","database":"connected"}'
+_NOT_READY_BODY = b'{"status":"not ready","database":"disconnected"}'
+
+# App logging: every module logs through logging.getLogger(__name__), i.e. a
+# child of the "app" logger. Handlers on the request path only put the record
+# on a queue; a background thread (the listener) does the actual write to
+# stderr, so logging never blocks a request on I/O.
+# This is set up by the running app (lifespan), not on import, so importing
+# app.main from tests, tooling or scripts starts no thread and leaves their
+# logging configuration alone.
+_LOG_FORMAT = "%(levelname)s:     %(name)s - %(message)s"
+
+
+def configure_logging() -> QueueListener:
+    """
+    Send the "app" logger's records through a queue to a stderr writer thread.
+
+    The queue is the logger's only output: propagation to the root logger is
+    turned off, since a root handler would write synchronously on the request
+    path (and print every record a second time). Returns the started listener;
+    pass it to shutdown_logging() when the app stops.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+    listener = QueueListener(log_queue, stream_handler)
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+    listener.start()
+    return listener
+
+
+def shutdown_logging(listener: QueueListener) -> None:
+    """Flush and stop the log listener, and hand "app" records back to the root logger."""
+    listener.stop()
+    app_logger = logging.getLogger("app")
+    for handler in app_logger.handlers[:]:
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            app_logger.removeHandler(handler)
+    app_logger.propagate = True
+
+
+# Define lifespan event to set up logging and optionally create database
+# tables on startup. Normally the schema comes from Alembic migrations, so
+# table creation only runs when RUN_DB_INIT=1 (create_all is blocking I/O,
+# so it runs in a worker thread instead of stalling the event loop)
 async def lifespan(app: FastAPI):
-    SQLModel.metadata.create_all(engine)
-    yield
+    log_listener = configure_logging()
+    try:
+        if settings.RUN_DB_INIT:
+            await run_in_threadpool(init_db)
+        yield
+    finally:
+        # Flush queued log records before the process exits
+        shutdown_logging(log_listener)
 
 # Create FastAPI app instance with lifespan event
-app = FastAPI(lifespan=lifespan)
+# ORJSONResponse renders response bodies with orjson (Rust) instead of the
+# standard library json module - noticeably faster for big lists like menus
+# and order histories.
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Set up CORS middleware for cross-origin requests from frontend
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:5173"],  # Frontend dev servers
+    allow_origins=[_FRONTEND_URL],  # Frontend origin (http://localhost:5173 in dev)
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists instead of "*" - these are everything the frontend uses
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["authorization", "content-type", "x-requested-with"],
+    # Let browsers cache preflight results for a day instead of re-sending
+    # an OPTIONS request before every API call
+    max_age=86400,
 )
 
 
@@ -53,39 +129,43 @@ app.add_middleware(
 async def health_check():
     """
     Basic health check - is the server running?
-    
+
     This is the simplest check. It just confirms the FastAPI server
     is up and can respond to HTTP requests.
-    
+
     Used by: Load balancers, container orchestrators (Kubernetes/Docker)
     """
     return {"status": "healthy"}
 
 
 @app.get("/health/ready")
-async def readiness_check():
+def readiness_check():
     """
     Readiness check - is the server ready to handle requests?
-    
+
     This does a deeper check by verifying we can connect to the database.
     If the database is down, we return 503 (Service Unavailable).
-    
+
+    Declared with plain `def` (not `async def`): the database driver is
+    blocking, so FastAPI runs this in its threadpool and a slow database
+    can't freeze the event loop for every other request.
+
     Used by: Kubernetes readiness probes, deployment health checks
-    
+
     Why separate from /health?
     - /health = "Is the process alive?" (restart if not)
     - /health/ready = "Can it serve traffic?" (don't send requests if not)
     """
     try:
         # Try to connect to database and run a simple query
-        with Session(engine) as session:
-            session.exec(select(1)).first()
-        return {"status": "ready", "database": "connected"}
-    except Exception as e:
+        # (a raw pooled connection is enough - no ORM Session needed)
+        with engine.connect() as connection:
+            connection.execute(_HEALTH_STMT).first()
+        return Response(content=_READY_BODY, media_type="application/json")
+    except Exception:
         # Return 503 Service Unavailable if database is down
-        from fastapi import Response
         return Response(
-            content='{"status": "not ready", "database": "disconnected"}',
+            content=_NOT_READY_BODY,
             status_code=503,
             media_type="application/json"
         )
@@ -1,4 +1,5 @@
 import enum
+from types import MappingProxyType
 
 class SystemRole(str, enum.Enum):
     SUPERADMIN = "superadmin"        # App admin - manages restaurants, owners, employees, customers
@@ -28,3 +29,25 @@ class OrderStatus(str, enum.Enum):
     READY = "ready"            # Ready for pickup/delivery
     COMPLETED = "completed"    # Customer received the order
     CANCELLED = "cancelled"    # Order was cancelled
+
+
+# Precomputed status groups (frozensets = O(1) membership checks)
+# Orders can only be cancelled before the kitchen starts preparing them
+CANCELLABLE_ORDER_STATUSES = frozenset({OrderStatus.PENDING, OrderStatus.PAID})
+
+# Orders that are not finished yet (not COMPLETED or CANCELLED)
+ACTIVE_ORDER_STATUSES = frozenset({
+    OrderStatus.PENDING,
+    OrderStatus.PAID,
+    OrderStatus.PREPARING,
+    OrderStatus.READY,
+})
+
+# Forward order status transitions (read-only). Cancelling is allowed from any
+# status in CANCELLABLE_ORDER_STATUSES; COMPLETED/CANCELLED are terminal.
+ORDER_STATUS_TRANSITIONS = MappingProxyType({
+    OrderStatus.PENDING: frozenset({OrderStatus.PAID}),
+    OrderStatus.PAID: frozenset({OrderStatus.PREPARING}),
+    OrderStatus.PREPARING: frozenset({OrderStatus.READY}),
+    OrderStatus.READY: frozenset({OrderStatus.COMPLETED}),
+})
@@ -2,16 +2,26 @@ from .enums import OrgRole
 from typing import TYPE_CHECKING
 
 from sqlmodel import Field, Relationship, SQLModel
+from pydantic import ConfigDict
 
 if TYPE_CHECKING:
     from .user import User
     from .restaurant import Restaurant
 
 
+from sqlalchemy import Index
 from sqlmodel import UniqueConstraint
 
 class Membership(SQLModel, table=True):
-    __table_args__ = (UniqueConstraint("user_id", "restaurant_id", name="uix_user_restaurant"),)
+    model_config = ConfigDict(defer_build=True)
+    __table_args__ = (
+        # One membership per user per restaurant. Its index also serves every
+        # lookup that starts from the user (RBAC checks, "my restaurants").
+        UniqueConstraint("user_id", "restaurant_id", name="uix_user_restaurant"),
+        # Listing a restaurant's staff starts from the restaurant instead,
+        # which the unique index above can't help with
+        Index("ix_membership_restaurant_id_id", "restaurant_id", "id"),
+    )
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     restaurant_id: int = Field(foreign_key="restaurant.id")
@@ -14,13 +14,15 @@ Relationships:
 - OrderItem references a Recipe
 """
 
-from datetime import datetime, timezone
+from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, List, Optional
 
+from sqlalchemy import DateTime, Index, func, text
 from sqlmodel import Field, Relationship, SQLModel
+from pydantic import ConfigDict
 
-from .enums import OrderStatus
+from .enums import ACTIVE_ORDER_STATUSES, OrderStatus
 
 if TYPE_CHECKING:
     from .user import User
@@ -28,6 +30,15 @@ if TYPE_CHECKING:
     from .recipe import Recipe
 
 
+# SQL condition for "order is still active" (status is stored by enum NAME)
+_ACTIVE_STATUS_SQL = "status IN ({})".format(
+    ", ".join(f"'{status.name}'" for status in OrderStatus if status in ACTIVE_ORDER_STATUSES)
+)
+
+# Shared zero amount for money defaults
+_ZERO = Decimal("0.00")
+
+
 # =============================================================================
 # Order Item Model
 # =============================================================================
@@ -39,6 +50,7 @@ class OrderItemBase(SQLModel):
     Why store unit_price here instead of just referencing the recipe?
     Because prices can change! We want to capture the price AT THE TIME of order.
     """
+    model_config = ConfigDict(defer_build=True)
     quantity: int = Field(ge=1, description="Number of this item ordered")
     unit_price: Decimal = Field(decimal_places=2, description="Price per unit at time of order")
     notes: str | None = Field(default=None, description="Special instructions (e.g., 'no onions')")
@@ -52,7 +64,7 @@ class OrderItem(OrderItemBase, table=True):
     with quantity=2 and unit_price=12.99
     """
     id: int | None = Field(default=None, primary_key=True)
-    order_id: int = Field(foreign_key="order.id", description="Which order this item belongs to")
+    order_id: int = Field(foreign_key="order.id", index=True, description="Which order this item belongs to")
     recipe_id: int = Field(foreign_key="recipe.id", description="Which menu item was ordered")
     
     # Computed field: quantity * unit_price
@@ -68,6 +80,7 @@ class OrderItemCreate(SQLModel):
     What the customer sends when creating an order item.
     They only need to specify the recipe and quantity - we look up the price.
     """
+    model_config = ConfigDict(defer_build=True)
     recipe_id: int
     quantity: int = Field(ge=1, default=1)
     notes: str | None = None
@@ -92,7 +105,8 @@ class OrderBase(SQLModel):
     total_amount is calculated from all OrderItems, but we store it
     for quick access (denormalization - a common pattern).
     """
-    total_amount: Decimal = Field(default=Decimal("0.00"), decimal_places=2)
+    model_config = ConfigDict(defer_build=True)
+    total_amount: Decimal = Field(default=_ZERO, decimal_places=2)
     status: OrderStatus = Field(default=OrderStatus.PENDING)
     notes: str | None = Field(default=None, description="General order notes")
 
@@ -103,6 +117,28 @@ class Order(OrderBase, table=True):
     
     Represents a customer's order from a restaurant.
     """
+    __mapper_args__ = {"eager_defaults": True}
+    
+    # Indexes for the hot order queries (each ends in created_at, id so the
+    # "newest first" ORDER BY - id breaks created_at ties for pagination - is
+    # read straight off the index, no sort):
+    # - a customer's order history
+    # - a restaurant's orders, optionally filtered by status
+    # - a restaurant's *active* orders (kitchen dashboard). This is a partial
+    #   index on PostgreSQL, so finished orders never bloat it.
+    __table_args__ = (
+        Index("ix_order_customer_created", "customer_id", "created_at", "id"),
+        Index("ix_order_restaurant_created", "restaurant_id", "created_at", "id"),
+        Index("ix_order_restaurant_status_created", "restaurant_id", "status", "created_at", "id"),
+        Index(
+            "ix_order_restaurant_active",
+            "restaurant_id",
+            "created_at",
+            "id",
+            postgresql_where=text(_ACTIVE_STATUS_SQL),
+        ).ddl_if(dialect="postgresql"),
+    )
+    
     id: int | None = Field(default=None, primary_key=True)
     
     # Who placed the order
@@ -111,17 +147,33 @@ class Order(OrderBase, table=True):
     # Which restaurant
     restaurant_id: int = Field(foreign_key="restaurant.id")
     
-    # Timestamps
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column_kwargs={"onupdate": lambda: datetime.now(timezone.utc)}
+    # Timestamps - filled in by the database (DEFAULT now() on insert,
+    # updated_at = now() on update), so no Python datetime is built or sent.
+    # eager_defaults (above) reads them back with RETURNING in the same
+    # statement, so the values are available without a refresh.
+    created_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    updated_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
     )
     
     # Relationships
     customer: "User" = Relationship(back_populates="orders")
     restaurant: "Restaurant" = Relationship(back_populates="orders")
-    items: List["OrderItem"] = Relationship(back_populates="order")
+    # Items are almost always needed with the order (every OrderRead includes
+    # them), so load them with one "WHERE order_id IN (...)" query for all
+    # loaded orders instead of one lazy query per order
+    items: List["OrderItem"] = Relationship(
+        back_populates="order",
+        sa_relationship_kwargs={"lazy": "selectin"}
+    )
 
 
 class OrderCreate(SQLModel):
@@ -133,6 +185,7 @@ class OrderCreate(SQLModel):
     - What items they want (list of recipe_id + quantity)
     - Optional notes
     """
+    model_config = ConfigDict(defer_build=True)
     restaurant_id: int
     items: List[OrderItemCreate]
     notes: str | None = None
@@ -157,5 +210,6 @@ class OrderUpdate(SQLModel):
     Fields that can be updated on an order.
     Mainly used by restaurant staff to update status.
     """
+    model_config = ConfigDict(defer_build=True)
     status: OrderStatus | None = None
     notes: str | None = None
@@ -1,32 +1,67 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from decimal import Decimal
 from typing import List, TYPE_CHECKING
 
+from sqlalchemy import DateTime, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import JSON, Column, Field, Relationship, SQLModel
+from pydantic import ConfigDict
 
 if TYPE_CHECKING:
     from .restaurant import Restaurant
 
 
+# Recipe lists are stored as JSONB on PostgreSQL (binary, no re-parsing on
+# read, and GIN-indexable) and fall back to plain JSON elsewhere (SQLite tests)
+_JSON_LIST = JSON().with_variant(JSONB(), "postgresql")
+
+# Shared zero amount for money defaults
+_ZERO = Decimal("0.00")
+
 
 class RecipeBase(SQLModel):
+    model_config = ConfigDict(defer_build=True)
     title: str
     description: str | None = None
-    ingredients: List[str] = Field(sa_column=Column(JSON))
-    instructions: List[str] = Field(sa_column=Column(JSON))
+    ingredients: List[str] = Field(sa_column=Column(_JSON_LIST))
+    instructions: List[str] = Field(sa_column=Column(_JSON_LIST))
     prep_time: int | None = None  # in minutes
     cook_time: int | None = None  # in minutes
     servings: int | None = None
-    price: Decimal = Field(default=Decimal("0.00"), decimal_places=2, description="Price of the item")
+    price: Decimal = Field(default=_ZERO, decimal_places=2, description="Price of the item")
     image_url: str | None = None  # S3 URL for recipe image
 
 class Recipe(RecipeBase, table=True):
+    __mapper_args__ = {"eager_defaults": True}
+    # GIN index for ingredient containment searches (ingredients @> '["tomato"]').
+    # jsonb_path_ops only supports @>, which is all we need, and builds a
+    # smaller, faster index than the default jsonb_ops.
+    # PostgreSQL only - other databases don't have GIN.
+    __table_args__ = (
+        Index(
+            "ix_recipe_ingredients_gin",
+            "ingredients",
+            postgresql_using="gin",
+            postgresql_ops={"ingredients": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Every recipe query is scoped to a restaurant: lists page through
+        # (restaurant_id, id) in order, and single lookups match both columns
+        Index("ix_recipe_restaurant_id_id", "restaurant_id", "id"),
+    )
     id: int | None = Field(default=None, primary_key=True)
     restaurant_id: int = Field(foreign_key="restaurant.id")  # Required field in the table
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column_kwargs={"onupdate": lambda: datetime.now(timezone.utc)}
+    # Set by the database: now() on insert, and again on every update
+    created_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    updated_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
     )
 
     restaurant: "Restaurant" = Relationship(back_populates="recipes")
@@ -41,6 +76,7 @@ class RecipeRead(RecipeBase):
     updated_at: datetime
 
 class RecipeUpdate(SQLModel):
+    model_config = ConfigDict(defer_build=True)
     title: str | None = None
     description: str | None = None
     ingredients: List[str] | None = None
@@ -1,5 +1,7 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import TYPE_CHECKING
+from sqlalchemy import DateTime, func
+from pydantic import field_validator
 from sqlmodel import Field, Relationship, SQLModel
 from .enums import ApprovalStatus
 
@@ -18,12 +20,22 @@ class RestaurantBase(SQLModel):
 
 
 class Restaurant(RestaurantBase, table=True):
+    __mapper_args__ = {"eager_defaults": True}
     id: int | None = Field(default=None, primary_key=True)
-    approval_status: ApprovalStatus = Field(default=ApprovalStatus.PENDING)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column_kwargs={"onupdate": lambda: datetime.now(timezone.utc)}
+    # Indexed: admin lists filter on it (pending approvals especially)
+    approval_status: ApprovalStatus = Field(default=ApprovalStatus.PENDING, index=True)
+    # Database-side timestamps (DEFAULT now() / SET updated_at = now())
+    created_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    updated_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
     )
 
     # Cascade delete: when restaurant is deleted, delete all its recipes and memberships
@@ -76,3 +88,9 @@ class RestaurantOwnerRegistration(SQLModel):
     cuisine_type: str | None = Field(default=None, max_length=50)
     address: str | None = None
     restaurant_phone: str | None = None
+
+    @field_validator('username', 'email')
+    def normalize_login_fields(cls, v):
+        # Stored lowercase like UserCreate's, so login's lower(username) match
+        # and the email lookups find owners too (User(...) itself doesn't validate)
+        return v.strip().lower()
@@ -1,7 +1,8 @@
-from datetime import datetime, timezone
+from datetime import datetime
 import re
+from sqlalchemy import DateTime, Index, func, text
 from sqlmodel import Column, Field, Relationship, SQLModel, Enum
-from pydantic import field_validator, EmailStr
+from pydantic import field_validator
 from .enums import SystemRole
 from typing import Optional, List, TYPE_CHECKING
 
@@ -11,6 +12,22 @@ if TYPE_CHECKING:
 
 from .enums import OrgRole
 
+# Validation patterns, compiled once at import
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_]+\Z')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+\Z')
+
+# Password rules: one pattern per rule (for specific error messages) plus a
+# combined lookahead pattern that checks all of them in a single call
+_PASSWORD_SPECIAL_CHARS = r'[!@#$%^&*(),.?":{}|<>]'
+_PASSWORD_UPPER_RE = re.compile(r'[A-Z]')
+_PASSWORD_LOWER_RE = re.compile(r'[a-z]')
+_PASSWORD_DIGIT_RE = re.compile(r'[0-9]')
+_PASSWORD_SPECIAL_RE = re.compile(_PASSWORD_SPECIAL_CHARS)
+_STRONG_PASSWORD_RE = re.compile(
+    r'(?=.*[A-Z])(?=.*[a-z])(?=.*[0-9])(?=.*' + _PASSWORD_SPECIAL_CHARS + r')',
+    re.DOTALL,
+)
+
 class UserBase(SQLModel):
     """
     Base model for User with common fields.
@@ -18,7 +35,9 @@ class UserBase(SQLModel):
     first_name: str = Field(max_length=50)
     last_name: str = Field(max_length=50)
     username: str = Field(index=True, unique=True, description="Unique username for the user")
-    email: EmailStr = Field(index=True, unique=True, description="User's email address")
+    # Plain str: format is checked by validate_email below with one compiled
+    # regex (EmailStr would run email-validator on top of that every time)
+    email: str = Field(index=True, unique=True, description="User's email address")
     role: SystemRole = Field(
         default=SystemRole.CUSTOMER,
         sa_column=Column(Enum(SystemRole, name="system_role", create_type=True)),
@@ -27,27 +46,43 @@ class UserBase(SQLModel):
 
     @field_validator('username')
     def validate_username(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_]+$', v):
+        if not _USERNAME_RE.match(v):
             raise ValueError('Username must be alphanumeric with underscores only')
         return v.lower()
     
     @field_validator('email')
     def validate_email(cls, v):
-        email_regex = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-        if not re.match(email_regex, v):
+        if not _EMAIL_RE.match(v):
             raise ValueError('Invalid email format')
         return v.lower()
 
 class User(UserBase, table=True):
     """User model for database table."""
+    __mapper_args__ = {"eager_defaults": True}
+    # role's column is declared on UserBase (sa_column), so its index lives here.
+    # Admin user lists and dashboard counts filter by role.
+    # Usernames are stored lowercase; the unique index on lower(username)
+    # keeps a mixed-case row (e.g. written by a script) from shadowing another.
+    __table_args__ = (
+        Index("ix_user_role", "role"),
+        Index("ix_user_username_lower", text("lower(username)"), unique=True),
+    )
     id: int | None = Field(default=None, primary_key=True)
     hashed_password: str = Field(max_length=255) # Store hashed password
     email_verified: bool = Field(default=False, description="Whether the user's email has been verified")
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column_kwargs={"onupdate": lambda: datetime.now(timezone.utc)}
-    ) 
+    # Set by the database, like the other tables' timestamps
+    created_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    updated_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
+    )
 
     # Cascade delete: when user is deleted, delete all their memberships
     memberships: list["Membership"] = Relationship(
@@ -66,15 +101,19 @@ class UserCreate(UserBase):
 
     @field_validator('password')
     def validate_password(cls, v):
+        # Fast path: valid passwords pass every rule in one regex call
+        if len(v) >= 8 and _STRONG_PASSWORD_RE.match(v):
+            return v
+        # Otherwise find the first failing rule to report it
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
-        if not re.search(r'[A-Z]', v):
+        if not _PASSWORD_UPPER_RE.search(v):
             raise ValueError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', v):
+        if not _PASSWORD_LOWER_RE.search(v):
             raise ValueError('Password must contain at least one lowercase letter')
-        if not re.search(r'[0-9]', v):
+        if not _PASSWORD_DIGIT_RE.search(v):
             raise ValueError('Password must contain at least one digit')
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
+        if not _PASSWORD_SPECIAL_RE.search(v):
             raise ValueError('Password must contain at least one special character')
         return v
 
@@ -98,6 +137,11 @@ class UserLogin(SQLModel):
     username: str
     password: str
 
+    @field_validator('username')
+    def normalize_username(cls, v):
+        # Usernames are stored lowercase, so "Alice " logs in as "alice"
+        return v.strip().lower()
+
 class Token(SQLModel):
     """Model for authentication token."""
     access_token: str
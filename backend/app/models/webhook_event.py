@@ -0,0 +1,29 @@
+"""
+Webhook Event Model
+
+Stripe delivers webhooks "at least once": if our response is slow or fails,
+the same event is sent again (for up to three days). Recording each event ID
+we have handled lets the webhook recognise a retry and skip it, so an order
+is never processed twice.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, func
+from sqlmodel import Field, SQLModel
+from pydantic import ConfigDict
+
+
+class ProcessedWebhookEvent(SQLModel, table=True):
+    """A Stripe event ID that has already been handled."""
+    model_config = ConfigDict(defer_build=True)
+    # Stripe's event ID (e.g. "evt_1Nq..."); the primary key is what makes
+    # a second insert of the same event a no-op
+    event_id: str = Field(primary_key=True, max_length=255)
+    # Set by the database; old rows can be purged once Stripe stops retrying
+    processed_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
@@ -2,7 +2,9 @@
 Admin routes for system administrators.
 Superadmins can manage users and approve restaurants.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
+from sqlalchemy import func, true, update
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select, or_
 from typing import List
 
@@ -10,97 +12,197 @@ from ..db.session import get_session
 from ..models.user import User, SystemRole, UserRead
 from ..models.restaurant import Restaurant, RestaurantRead, ApprovalStatus
 from ..models.membership import Membership, OrgRole
+from ..models.recipe import Recipe
+from ..utilities.auth import invalidate_cached_user
 from ..utilities.rbac import require_superadmin
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
+# --- Read Model Helpers ---
+# Rows loaded from the database are already valid, so we build the response
+# models with model_construct() (no validation) and declare response_model=None
+# on the routes so FastAPI doesn't validate them a second time. The
+# `responses=` argument keeps the schema in the OpenAPI docs.
+_USER_READ_FIELDS = tuple(UserRead.model_fields)
+_RESTAURANT_READ_FIELDS = tuple(RestaurantRead.model_fields)
+
+# List endpoints select just these columns: plain rows come back instead of
+# ORM objects, so there's no identity map or attribute instrumentation per row.
+_USER_READ_COLUMNS = tuple(getattr(User, name) for name in _USER_READ_FIELDS)
+_RESTAURANT_READ_COLUMNS = tuple(getattr(Restaurant, name) for name in _RESTAURANT_READ_FIELDS)
+
+
+def _to_user_read(user: User) -> UserRead:
+    """Copy a User row into a UserRead without re-validating it."""
+    return UserRead.model_construct(**{name: getattr(user, name) for name in _USER_READ_FIELDS})
+
+
+def _to_restaurant_read(restaurant: Restaurant) -> RestaurantRead:
+    """Copy a Restaurant row into a RestaurantRead without re-validating it."""
+    return RestaurantRead.model_construct(
+        **{name: getattr(restaurant, name) for name in _RESTAURANT_READ_FIELDS}
+    )
+
+
+# --- Status Update Helpers ---
+# Status flips are a single UPDATE ... WHERE id = :id AND <precondition>
+# RETURNING *, so the precondition check and the write happen atomically in
+# one round-trip (no SELECT -> mutate -> commit -> refresh). Only when no row
+# matched do we look the row up, to tell "not found" apart from "wrong state".
+def _update_returning(stmt, session: Session):
+    """Run an UPDATE ... RETURNING statement, commit, and return the updated row (or None)."""
+    row = session.exec(stmt).scalar_one_or_none()
+    session.commit()
+    return row
+
+
+def _raise_not_pending(restaurant_id: int, session: Session):
+    """Raise the right error after an approve/reject UPDATE matched no rows."""
+    restaurant = session.get(Restaurant, restaurant_id)
+    if restaurant is None:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    raise HTTPException(
+        status_code=400,
+        detail=f"Restaurant is already {restaurant.approval_status}"
+    )
+
+
 # --- User Management ---
-@router.get("/users", response_model=List[UserRead])
-async def list_all_users(
+@router.get("/users", response_model=None, responses={200: {"model": List[UserRead]}})
+def list_all_users(
     role: SystemRole | None = Query(None, description="Filter by role"),
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of users to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return users with an ID greater than this (the last ID of the previous page)"),
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
-):
-    """List all users in the system. Superadmin only."""
-    query = select(User)
+) -> List[UserRead]:
+    """
+    List users in the system, ordered by ID. Superadmin only.
+    
+    Keyset pagination: pass `limit`, then the last `id` you received as
+    `cursor` to get the next page. Unlike OFFSET, `WHERE id > :cursor` walks
+    the primary key index straight to the next page, and memory per request
+    is bounded by `limit`. Paging is opt-in - the admin users page reads the
+    list in one request, so without `limit` every user comes back.
+    """
+    query = select(*_USER_READ_COLUMNS).order_by(User.id).limit(limit)
     
     if role:
         query = query.where(User.role == role)
     
-    users = session.exec(query).all()
-    return users
+    if cursor is not None:
+        query = query.where(User.id > cursor)
+    
+    rows = session.exec(query).all()
+    return [UserRead.model_construct(**row._mapping) for row in rows]
 
 
-@router.get("/users/{user_id}", response_model=UserRead)
-async def get_user_details(
+@router.get("/users/{user_id}", response_model=None, responses={200: {"model": UserRead}})
+def get_user_details(
     user_id: int,
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
-):
+) -> UserRead:
     """Get detailed information about a specific user. Superadmin only."""
     user = session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return _to_user_read(user)
 
 
 @router.patch("/users/{user_id}/suspend")
-async def suspend_user(
+def suspend_user(
     user_id: int,
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
 ):
     """Suspend a user account. Superadmin only."""
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # The caller is a superadmin, so targeting themselves can be refused
+    # without touching the database
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot suspend yourself"
+        )
     
-    if user.role == SystemRole.SUPERADMIN:
+    user = _update_returning(
+        update(User)
+        .where(User.id == user_id, User.role != SystemRole.SUPERADMIN)
+        .values(role=SystemRole.SUSPENDED)
+        .returning(User),
+        session,
+    )
+    if user is None:
+        # Nothing matched - look the row up only now to report why
+        if session.get(User, user_id) is None:
+            raise HTTPException(status_code=404, detail="User not found")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot suspend another superadmin"
         )
+    invalidate_cached_user(user.username)
+    
+    return {"message": f"User {user.username} has been suspended", "user": _to_user_read(user)}
+
+
+@router.patch("/users/suspend-bulk")
+def suspend_users_bulk(
+    user_ids: list[int] = Body(..., min_length=1, max_length=1000),
+    current_user: User = Depends(require_superadmin),
+    session: Session = Depends(get_session)
+):
+    """
+    Suspend many user accounts at once. Superadmin only.
     
-    user.role = SystemRole.SUSPENDED
-    session.add(user)
+    One UPDATE ... WHERE id IN (...) instead of one request per user.
+    Superadmins and unknown IDs are skipped; the response says how many
+    accounts were actually suspended.
+    """
+    result = session.exec(
+        update(User)
+        .where(User.id.in_(user_ids), User.role != SystemRole.SUPERADMIN)
+        .values(role=SystemRole.SUSPENDED)
+    )
     session.commit()
-    session.refresh(user)
+    # We don't know which usernames were hit, so drop every cached user
+    invalidate_cached_user()
     
-    return {"message": f"User {user.username} has been suspended", "user": user}
+    return {"suspended": result.rowcount}
 
 
 @router.patch("/users/{user_id}/unsuspend")
-async def unsuspend_user(
+def unsuspend_user(
     user_id: int,
     restore_role: SystemRole,
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
 ):
     """Unsuspend a user account and restore their role. Superadmin only."""
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    if user.role != SystemRole.SUSPENDED:
-        raise HTTPException(status_code=400, detail="User is not suspended")
-    
-    if restore_role == SystemRole.SUPERADMIN:
+    if restore_role is SystemRole.SUPERADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot promote users to superadmin via this endpoint"
         )
     
-    user.role = restore_role
-    session.add(user)
-    session.commit()
-    session.refresh(user)
+    user = _update_returning(
+        update(User)
+        .where(User.id == user_id, User.role == SystemRole.SUSPENDED)
+        .values(role=restore_role)
+        .returning(User),
+        session,
+    )
+    if user is None:
+        if session.get(User, user_id) is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        raise HTTPException(status_code=400, detail="User is not suspended")
+    invalidate_cached_user(user.username)
     
-    return {"message": f"User {user.username} has been unsuspended", "user": user}
+    return {"message": f"User {user.username} has been unsuspended", "user": _to_user_read(user)}
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(
+def delete_user(
     user_id: int,
     delete_owned_restaurants: bool = Query(False, description="Also delete restaurants owned by this user"),
     current_user: User = Depends(require_superadmin),
@@ -114,11 +216,18 @@ async def delete_user(
     
     Cannot delete superadmin users.
     """
+    # Same shortcut as suspend_user: the caller is a superadmin
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot delete superadmin users"
+        )
+    
     user = session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    if user.role == SystemRole.SUPERADMIN:
+    if user.role is SystemRole.SUPERADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot delete superadmin users"
@@ -134,6 +243,7 @@ async def delete_user(
             )
         ).all()
         
+        sole_admin_restaurant_ids = []
         for membership in admin_memberships:
             # Check if user is the only admin for this restaurant
             admin_count = len(session.exec(
@@ -144,161 +254,195 @@ async def delete_user(
             ).all())
             
             if admin_count == 1:
-                # User is the only admin, delete the restaurant
-                # Cascade will automatically delete recipes and all memberships
-                restaurant = session.get(Restaurant, membership.restaurant_id)
-                if restaurant:
-                    session.delete(restaurant)
+                sole_admin_restaurant_ids.append(membership.restaurant_id)
+        
+        if sole_admin_restaurant_ids:
+            # User is the only admin, delete the restaurants.
+            # Cascade will automatically delete recipes and all memberships -
+            # the ORM has to load those collections first, so selectinload
+            # fetches them for all restaurants at once instead of per restaurant.
+            # Deleting a recipe only needs its primary key, so skip its JSON columns.
+            restaurants = session.exec(
+                select(Restaurant)
+                .where(Restaurant.id.in_(sole_admin_restaurant_ids))
+                .options(
+                    selectinload(Restaurant.recipes).load_only(Recipe.id),
+                    selectinload(Restaurant.memberships),
+                )
+            ).all()
+            for restaurant in restaurants:
+                session.delete(restaurant)
     
     # Delete the user (cascade will automatically delete their memberships)
     session.delete(user)
     session.commit()
+    invalidate_cached_user(user.username)
     
     return None
 
 
 # --- Restaurant Management ---
-@router.get("/restaurants", response_model=List[RestaurantRead])
-async def list_all_restaurants(
+@router.get("/restaurants", response_model=None, responses={200: {"model": List[RestaurantRead]}})
+def list_all_restaurants(
     approval_status: ApprovalStatus | None = Query(None, description="Filter by approval status"),
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of restaurants to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return restaurants with an ID greater than this (the last ID of the previous page)"),
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
-):
-    """List all restaurants. Superadmin only."""
-    query = select(Restaurant)
+) -> List[RestaurantRead]:
+    """List restaurants, ordered by ID and paginated like /admin/users. Superadmin only."""
+    query = select(*_RESTAURANT_READ_COLUMNS).order_by(Restaurant.id).limit(limit)
+    
+    if cursor is not None:
+        query = query.where(Restaurant.id > cursor)
     
     if approval_status:
         query = query.where(Restaurant.approval_status == approval_status)
     
-    restaurants = session.exec(query).all()
-    return restaurants
+    rows = session.exec(query).all()
+    return [RestaurantRead.model_construct(**row._mapping) for row in rows]
 
 
-@router.get("/restaurants/pending", response_model=List[RestaurantRead])
-async def list_pending_restaurants(
+@router.get("/restaurants/pending", response_model=None, responses={200: {"model": List[RestaurantRead]}})
+def list_pending_restaurants(
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of restaurants to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return restaurants with an ID greater than this (the last ID of the previous page)"),
+    current_user: User = Depends(require_superadmin),
+    session: Session = Depends(get_session)
+) -> List[RestaurantRead]:
+    """List restaurants pending approval, paginated like /admin/users. Superadmin only."""
+    query = (
+        select(*_RESTAURANT_READ_COLUMNS)
+        .where(Restaurant.approval_status == ApprovalStatus.PENDING)
+        .order_by(Restaurant.id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        query = query.where(Restaurant.id > cursor)
+    rows = session.exec(query).all()
+    return [RestaurantRead.model_construct(**row._mapping) for row in rows]
+
+
+@router.patch("/restaurants/approve-bulk")
+def approve_restaurants_bulk(
+    restaurant_ids: list[int] = Body(..., min_length=1, max_length=1000),
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
 ):
-    """List all restaurants pending approval. Superadmin only."""
-    restaurants = session.exec(
-        select(Restaurant).where(Restaurant.approval_status == ApprovalStatus.PENDING)
-    ).all()
-    return restaurants
+    """
+    Approve many pending restaurants at once. Superadmin only.
+    
+    Restaurants that aren't pending (or don't exist) are skipped.
+    """
+    result = session.exec(
+        update(Restaurant)
+        .where(Restaurant.id.in_(restaurant_ids), Restaurant.approval_status == ApprovalStatus.PENDING)
+        .values(approval_status=ApprovalStatus.APPROVED)
+    )
+    session.commit()
+    
+    return {"approved": result.rowcount}
 
 
 @router.patch("/restaurants/{restaurant_id}/approve")
-async def approve_restaurant(
+def approve_restaurant(
     restaurant_id: int,
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
 ):
     """Approve a restaurant registration. Superadmin only."""
-    restaurant = session.get(Restaurant, restaurant_id)
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
-    
-    if restaurant.approval_status != ApprovalStatus.PENDING:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Restaurant is already {restaurant.approval_status}"
-        )
-    
-    restaurant.approval_status = ApprovalStatus.APPROVED
-    session.add(restaurant)
-    session.commit()
-    session.refresh(restaurant)
+    restaurant = _update_returning(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id, Restaurant.approval_status == ApprovalStatus.PENDING)
+        .values(approval_status=ApprovalStatus.APPROVED)
+        .returning(Restaurant),
+        session,
+    )
+    if restaurant is None:
+        _raise_not_pending(restaurant_id, session)
     
     return {
         "message": f"Restaurant '{restaurant.restaurant_name}' has been approved",
-        "restaurant": restaurant
+        "restaurant": _to_restaurant_read(restaurant)
     }
 
 
 @router.patch("/restaurants/{restaurant_id}/reject")
-async def reject_restaurant(
+def reject_restaurant(
     restaurant_id: int,
     reason: str | None = None,
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
 ):
     """Reject a restaurant registration. Superadmin only."""
-    restaurant = session.get(Restaurant, restaurant_id)
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
-    
-    if restaurant.approval_status != ApprovalStatus.PENDING:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Restaurant is already {restaurant.approval_status}"
-        )
-    
-    restaurant.approval_status = ApprovalStatus.REJECTED
-    session.add(restaurant)
-    session.commit()
-    session.refresh(restaurant)
+    restaurant = _update_returning(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id, Restaurant.approval_status == ApprovalStatus.PENDING)
+        .values(approval_status=ApprovalStatus.REJECTED)
+        .returning(Restaurant),
+        session,
+    )
+    if restaurant is None:
+        _raise_not_pending(restaurant_id, session)
     
     return {
         "message": f"Restaurant '{restaurant.restaurant_name}' has been rejected",
         "reason": reason,
-        "restaurant": restaurant
+        "restaurant": _to_restaurant_read(restaurant)
     }
 
 
 @router.patch("/restaurants/{restaurant_id}/suspend")
-async def suspend_restaurant(
+def suspend_restaurant(
     restaurant_id: int,
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
 ):
     """Suspend a restaurant. Superadmin only."""
-    restaurant = session.get(Restaurant, restaurant_id)
-    if not restaurant:
+    restaurant = _update_returning(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .values(approval_status=ApprovalStatus.SUSPENDED)
+        .returning(Restaurant),
+        session,
+    )
+    if restaurant is None:
         raise HTTPException(status_code=404, detail="Restaurant not found")
     
-    restaurant.approval_status = ApprovalStatus.SUSPENDED
-    session.add(restaurant)
-    session.commit()
-    session.refresh(restaurant)
-    
     return {
         "message": f"Restaurant '{restaurant.restaurant_name}' has been suspended",
-        "restaurant": restaurant
+        "restaurant": _to_restaurant_read(restaurant)
     }
 
 
 # --- Dashboard Stats ---
 @router.get("/stats")
-async def get_admin_dashboard_stats(
+def get_admin_dashboard_stats(
     current_user: User = Depends(require_superadmin),
     session: Session = Depends(get_session)
 ):
     """Get statistics for admin dashboard. Superadmin only."""
     
-    # Count users by role
-    total_customers = len(session.exec(
-        select(User).where(User.role == SystemRole.CUSTOMER)
-    ).all())
-    
-    total_owners = len(session.exec(
-        select(User).where(User.role == SystemRole.RESTAURANT_OWNER)
-    ).all())
-    
-    suspended_users = len(session.exec(
-        select(User).where(User.role == SystemRole.SUSPENDED)
-    ).all())
-    
-    # Count restaurants by status
-    pending_restaurants = len(session.exec(
-        select(Restaurant).where(Restaurant.approval_status == ApprovalStatus.PENDING)
-    ).all())
-    
-    approved_restaurants = len(session.exec(
-        select(Restaurant).where(Restaurant.approval_status == ApprovalStatus.APPROVED)
-    ).all())
-    
-    suspended_restaurants = len(session.exec(
-        select(Restaurant).where(Restaurant.approval_status == ApprovalStatus.SUSPENDED)
-    ).all())
+    # Count users by role and restaurants by status in ONE round-trip:
+    # each side is a single-row aggregate (COUNT(*) FILTER (WHERE ...) counts
+    # every bucket in one table scan), and the two rows are joined side by side.
+    user_counts = select(
+        func.count().filter(User.role == SystemRole.CUSTOMER).label("customers"),
+        func.count().filter(User.role == SystemRole.RESTAURANT_OWNER).label("restaurant_owners"),
+        func.count().filter(User.role == SystemRole.SUSPENDED).label("suspended_users"),
+    ).subquery()
+    restaurant_counts = select(
+        func.count().filter(Restaurant.approval_status == ApprovalStatus.PENDING).label("pending"),
+        func.count().filter(Restaurant.approval_status == ApprovalStatus.APPROVED).label("approved"),
+        func.count().filter(Restaurant.approval_status == ApprovalStatus.SUSPENDED).label("suspended_restaurants"),
+    ).subquery()
+    
+    (
+        total_customers, total_owners, suspended_users,
+        pending_restaurants, approved_restaurants, suspended_restaurants,
+    ) = session.exec(
+        select(user_counts, restaurant_counts).join_from(user_counts, restaurant_counts, true())
+    ).one()
     
     return {
         "users": {
@@ -1,15 +1,21 @@
 # auth_routes.py
-from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlmodel import Session, select
+import logging
+import threading
+import time
+from collections import OrderedDict
 
-from ..utilities.auth import get_current_user
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Response
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, or_, select
+
+from ..utilities.auth import get_current_user, invalidate_cached_user
 from ..db.session import get_session
 from ..models.user import User, UserCreate, UserRead, SystemRole, UserLogin
 from ..models.membership import Membership, OrgRole
 from ..models.restaurant import Restaurant, RestaurantOwnerRegistration
 from pydantic import BaseModel, EmailStr
-from ..utilities.auth_utils import verify_password, hash_password, create_access_token, create_password_reset_token, verify_password_reset_token, create_email_verification_token, verify_email_verification_token
+from ..utilities.auth_utils import ACCESS_TOKEN_EXPIRE, verify_and_update_password, hash_password, create_access_token, create_password_reset_token, verify_password_reset_token, create_email_verification_token, verify_email_verification_token
 from ..utilities.email import send_password_reset_email, send_verification_email
 from ..config import settings
 
@@ -21,25 +27,154 @@ COOKIE_SAMESITE = "lax"  # "strict" blocks cross-site, "lax" allows top-level na
 COOKIE_HTTPONLY = True  # Prevents JavaScript access
 COOKIE_PATH = "/"
 
+# Shared cookie attributes, built once for login and logout. delete_cookie
+# must repeat the attributes (minus max_age) or browsers keep the cookie.
+_SET_COOKIE_KWARGS = dict(
+    key=COOKIE_NAME,
+    max_age=COOKIE_MAX_AGE,
+    httponly=COOKIE_HTTPONLY,
+    secure=COOKIE_SECURE,
+    samesite=COOKIE_SAMESITE,
+    path=COOKIE_PATH,
+)
+_DELETE_COOKIE_KWARGS = {k: v for k, v in _SET_COOKIE_KWARGS.items() if k != "max_age"}
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Endpoints that touch the database, hash passwords or send email are plain
+# `def`: FastAPI runs those in its threadpool, so the blocking Session calls,
+# Argon2 and SMTP never stall the event loop. Only /me and /logout, which do
+# no blocking work of their own, stay `async def`.
+
+# Fields /auth/me exposes; current_user already holds exactly these columns
+_ME_FIELDS = set(UserRead.model_fields)
+
+# Login checks unknown usernames against this hash so a miss costs the same
+# Argon2 verify as a wrong password: no username-probing via timing, and
+# login latency stays flat instead of having a fast-fail path.
+_DUMMY_PASSWORD_HASH = hash_password("dummy-password-never-matches")
+
+# Per-address throttle for the endpoints that send email to whatever address
+# they're given (forgot-password, resend-verification). Hammering one address
+# would otherwise cost a SELECT plus an outbound email on every request.
+# (kind, email) -> expiry; LRU-bounded like the auth caches. These handlers
+# run in the threadpool, so access is guarded by a lock.
+_EMAIL_REQUEST_COOLDOWN = settings.EMAIL_REQUEST_COOLDOWN_SECONDS
+_EMAIL_REQUEST_MAX_TRACKED = settings.USER_CACHE_MAX_SIZE
+_recent_email_requests: OrderedDict[tuple[str, str], float] = OrderedDict()
+_recent_email_requests_lock = threading.Lock()
+
+
+def _email_request_throttled(kind: str, email: str) -> bool:
+    """
+    Return True if a `kind` email already went to this address within the
+    cooldown. Otherwise record this request and return False.
+    """
+    if _EMAIL_REQUEST_COOLDOWN <= 0:
+        return False
+    key = (kind, email.lower())
+    now = time.monotonic()
+    with _recent_email_requests_lock:
+        expires = _recent_email_requests.get(key)
+        if expires is not None and expires > now:
+            return True
+        _recent_email_requests[key] = now + _EMAIL_REQUEST_COOLDOWN
+        _recent_email_requests.move_to_end(key)
+        if len(_recent_email_requests) > _EMAIL_REQUEST_MAX_TRACKED:
+            _recent_email_requests.popitem(last=False)
+    return False
+
+
+def _ensure_username_and_email_available(session: Session, username: str, email: str | None) -> None:
+    """
+    Raise 400 if the username or email is already registered.
+    
+    One SELECT covers both unique fields (WHERE username = :u OR email = :e);
+    the matching rows tell us which one collided. Username conflicts are
+    reported first, as before.
+    """
+    condition = User.username == username
+    if email:
+        condition = or_(condition, User.email == email)
+    
+    conflicts = session.exec(select(User.username, User.email).where(condition).limit(2)).all()
+    if any(row.username == username for row in conflicts):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
+    if conflicts:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+
+
+# The unique indexes behind "already registered": PostgreSQL reports the
+# index name, SQLite (tests) reports "UNIQUE constraint failed: user.<column>"
+# (or "index '<name>'" for the lower(username) expression index)
+_USER_UNIQUE_CONSTRAINTS = frozenset({"ix_user_username", "ix_user_username_lower", "ix_user_email"})
+_USER_UNIQUE_COLUMNS = ("user.username", "user.email", "index 'ix_user_username_lower'")
+
+
+def _integrity_error_kind(exc: IntegrityError) -> str | None:
+    """
+    Classify a failed registration commit.
+    
+    Returns "duplicate_user" for a clash on the username/email unique indexes,
+    "foreign_key" for a reference to a row that doesn't exist, and None for
+    anything else.
+    """
+    orig = exc.orig
+    pgcode = getattr(orig, "pgcode", None)
+    if pgcode is not None:
+        # PostgreSQL SQLSTATEs: 23505 unique_violation, 23503 foreign_key_violation
+        if pgcode == "23505" and orig.diag.constraint_name in _USER_UNIQUE_CONSTRAINTS:
+            return "duplicate_user"
+        if pgcode == "23503":
+            return "foreign_key"
+        return None
+    
+    message = str(orig)
+    if message.startswith("UNIQUE constraint failed") and any(column in message for column in _USER_UNIQUE_COLUMNS):
+        return "duplicate_user"
+    if message.startswith("FOREIGN KEY constraint failed"):
+        return "foreign_key"
+    return None
+
+
+def _commit_registration(session: Session) -> None:
+    """
+    Commit everything a registration created as ONE transaction.
+    
+    ids and timestamps come back via INSERT ... RETURNING, so no refresh is
+    needed. If a concurrent registration grabbed the username/email after our
+    availability check, the unique index rejects it and we report a 400.
+    The only reference a registration supplies is register_user's
+    restaurant_id, so a foreign key violation means that restaurant doesn't
+    exist. Any other integrity error is a bug, not bad input, and is re-raised.
+    """
+    try:
+        session.commit()
+    except IntegrityError as exc:
+        session.rollback()
+        kind = _integrity_error_kind(exc)
+        if kind == "duplicate_user":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username or email already registered")
+        if kind == "foreign_key":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Restaurant not found")
+        raise
+
+
 # --- User Registration Endpoint ---
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-async def register_user(user_in: UserCreate, session: Session = Depends(get_session)):
+def register_user(
+    user_in: UserCreate,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session)
+):
     """
     Registers a new user with both system role and optional organization role.
     Sends a verification email to confirm the user's email address.
     """
-    # Check if username already exists
-    existing_user = session.exec(select(User).where(User.username == user_in.username)).first()
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
-
-    # Check if email already exists (if provided)
-    if user_in.email:
-        existing_email_user = session.exec(select(User).where(User.email == user_in.email)).first()
-        if existing_email_user:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    # Check that the username and email (if provided) aren't taken
+    _ensure_username_and_email_available(session, user_in.username, user_in.email)
 
     # Hash the password before storing
     hashed_password = hash_password(user_in.password)
@@ -58,51 +193,45 @@ async def register_user(user_in: UserCreate, session: Session = Depends(get_sess
     )
 
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
 
     # If organization role and restaurant_id are provided, create a membership
+    # (linked through the relationship, so the user's id is filled in at flush)
     if user_in.org_role and user_in.restaurant_id:
-        membership = Membership(
-            user_id=db_user.id,
+        session.add(Membership(
+            user=db_user,
             restaurant_id=user_in.restaurant_id,
             role=user_in.org_role
-        )
-        session.add(membership)
-        session.commit()
+        ))
+
+    # One transaction for the user and membership
+    _commit_registration(session)
 
-    # Send verification email
+    # Send verification email after the response goes out - the email API
+    # call would otherwise add its full round trip to the signup request.
+    # send_email logs whether delivery succeeded.
     if db_user.email:
         verification_token = create_email_verification_token(db_user.email)
-        email_sent = send_verification_email(db_user.email, verification_token, db_user.first_name)
-        if email_sent:
-            print(f"Verification email sent to {db_user.email}")
-        else:
-            print(f"WARNING: Failed to send verification email to {db_user.email}")
+        background_tasks.add_task(
+            send_verification_email, db_user.email, verification_token, db_user.first_name
+        )
     else:
-        print(f"WARNING: User {db_user.username} has no email, skipping verification email")
+        logger.warning("User %s has no email, skipping verification email", db_user.username)
 
     return db_user
 
 # --- Restaurant Owner Registration Endpoint ---
 @router.post("/register/restaurant-owner", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-async def register_restaurant_owner(
+def register_restaurant_owner(
     registration_data: RestaurantOwnerRegistration,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session)
 ):
     """
     Registers a new restaurant owner with restaurant details.
     Creates: User (owner) + Restaurant + Membership (owner as restaurant_admin)
     """
-    # Check if username already exists
-    existing_user = session.exec(select(User).where(User.username == registration_data.username)).first()
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
-
-    # Check if email already exists
-    existing_email_user = session.exec(select(User).where(User.email == registration_data.email)).first()
-    if existing_email_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    # Check that the username and email aren't taken
+    _ensure_username_and_email_available(session, registration_data.username, registration_data.email)
 
     # Hash the password
     hashed_password = hash_password(registration_data.password)
@@ -118,10 +247,6 @@ async def register_restaurant_owner(
         email_verified=False,  # New users start with unverified email
     )
     
-    session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
-    
     # Create the restaurant
     db_restaurant = Restaurant(
         restaurant_name=registration_data.restaurant_name,
@@ -130,36 +255,34 @@ async def register_restaurant_owner(
         phone=registration_data.restaurant_phone
     )
     
-    session.add(db_restaurant)
-    session.commit()
-    session.refresh(db_restaurant)
-    
-    # Create membership linking owner to restaurant with RESTAURANT_ADMIN role
+    # Create membership linking owner to restaurant with RESTAURANT_ADMIN role.
+    # Linking through the relationships lets one flush insert user, restaurant
+    # and membership in order and fill in the foreign keys.
     membership = Membership(
-        user_id=db_user.id,
-        restaurant_id=db_restaurant.id,
+        user=db_user,
+        restaurant=db_restaurant,
         role=OrgRole.RESTAURANT_ADMIN
     )
     
-    session.add(membership)
-    session.commit()
+    session.add_all([db_user, db_restaurant, membership])
+    _commit_registration(session)
     
-    # Send verification email
+    # Send verification email after the response goes out - the email API
+    # call would otherwise add its full round trip to the signup request.
+    # send_email logs whether delivery succeeded.
     if db_user.email:
         verification_token = create_email_verification_token(db_user.email)
-        email_sent = send_verification_email(db_user.email, verification_token, db_user.first_name)
-        if email_sent:
-            print(f"Verification email sent to {db_user.email}")
-        else:
-            print(f"WARNING: Failed to send verification email to {db_user.email}")
+        background_tasks.add_task(
+            send_verification_email, db_user.email, verification_token, db_user.first_name
+        )
     else:
-        print(f"WARNING: User {db_user.username} has no email, skipping verification email")
+        logger.warning("User %s has no email, skipping verification email", db_user.username)
     
     return db_user
 
 # --- Login Endpoint ---
 @router.post("/token")
-async def login_for_access_token(
+def login_for_access_token(
     response: Response,
     credentials: UserLogin,
     session: Session = Depends(get_session)
@@ -172,13 +295,32 @@ async def login_for_access_token(
     username = credentials.username
     password = credentials.password
     
-    user = session.exec(select(User).where(User.username == username)).first()
-    if not user or not verify_password(password, user.hashed_password):
+    # Just the columns login needs (profile fields + hash), as a plain row.
+    # Usernames are stored lowercase (the unique ix_user_username_lower index
+    # guarantees it stays that way) and UserLogin lowercases the input, so a
+    # plain equality on the unique username index finds the one match.
+    user = session.exec(
+        select(
+            User.id, User.username, User.email, User.first_name,
+            User.last_name, User.role, User.email_verified, User.hashed_password,
+        ).where(User.username == username)
+    ).first()
+    # Unknown users still pay for a verify (against the dummy hash)
+    password_ok, new_hash = verify_and_update_password(
+        password,
+        user.hashed_password if user else _DUMMY_PASSWORD_HASH,
+    )
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    # Old bcrypt hashes are upgraded to Argon2id on successful login
+    if new_hash:
+        session.exec(update(User).where(User.id == user.id).values(hashed_password=new_hash))
+        session.commit()
 
     # DEVELOPMENT MODE: Email verification check disabled for testing
     # In production, uncomment this block to require email verification
@@ -189,22 +331,13 @@ async def login_for_access_token(
     #     )
 
     # Create the access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username},
-        expires_delta=access_token_expires
+        data={"sub": user.username, "uid": user.id},
+        expires_delta=ACCESS_TOKEN_EXPIRE
     )
     
     # Set httpOnly cookie instead of returning token in body
-    response.set_cookie(
-        key=COOKIE_NAME,
-        value=access_token,
-        max_age=COOKIE_MAX_AGE,
-        httponly=COOKIE_HTTPONLY,
-        secure=COOKIE_SECURE,
-        samesite=COOKIE_SAMESITE,
-        path=COOKIE_PATH,
-    )
+    response.set_cookie(value=access_token, **_SET_COOKIE_KWARGS)
     
     # Return user profile (frontend needs user data, not the token)
     return {
@@ -224,13 +357,7 @@ async def logout(response: Response):
     """
     Logs out user by clearing the httpOnly cookie.
     """
-    response.delete_cookie(
-        key=COOKIE_NAME,
-        path=COOKIE_PATH,
-        httponly=COOKIE_HTTPONLY,
-        secure=COOKIE_SECURE,
-        samesite=COOKIE_SAMESITE,
-    )
+    response.delete_cookie(**_DELETE_COOKIE_KWARGS)
     return {"message": "Logged out successfully"}
 
 
@@ -240,8 +367,17 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     """
     Retrieves the current authenticated user's information.
     Requires a valid JWT in the Authorization header or cookie.
+    
+    This is one of the hottest endpoints (the frontend calls it on every page
+    load), so we serialize current_user straight to JSON bytes with pydantic's
+    Rust serializer and return them. Returning a Response skips FastAPI's
+    validate-into-UserRead-then-encode pass; response_model is kept so the
+    OpenAPI schema still documents the shape.
     """
-    return current_user
+    return Response(
+        content=current_user.model_dump_json(include=_ME_FIELDS),
+        media_type="application/json",
+    )
 
 
 # --- Password Reset Request/Response Models ---
@@ -258,8 +394,9 @@ class ResetPasswordRequest(BaseModel):
 
 # --- Forgot Password Endpoint ---
 @router.post("/forgot-password")
-async def forgot_password(
+def forgot_password(
     request: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session)
 ):
     """
@@ -269,19 +406,20 @@ async def forgot_password(
     For security, always returns success even if email doesn't exist
     (prevents email enumeration attacks).
     """
-    # Find user by email
-    user = session.exec(select(User).where(User.email == request.email)).first()
+    # Look up the stored address (that column is all we need) - unless a link
+    # went to this address moments ago, in which case go straight to the response
+    email = None
+    if not _email_request_throttled("password_reset", request.email):
+        email = session.exec(select(User.email).where(User.email == request.email)).first()
     
-    if user:
+    if email:
         # Generate password reset token
-        reset_token = create_password_reset_token(user.email)
+        reset_token = create_password_reset_token(email)
         
-        # Send the reset email
-        email_sent = send_password_reset_email(user.email, reset_token)
-        
-        if not email_sent:
-            # Log the error but don't expose it to user
-            print(f"Failed to send password reset email to {user.email}")
+        # Send the reset email after responding. This also keeps the response
+        # time the same whether or not the email exists. Failures are logged
+        # by send_email, never exposed to the user.
+        background_tasks.add_task(send_password_reset_email, email, reset_token)
     
     # Always return success to prevent email enumeration
     # An attacker shouldn't be able to determine if an email exists
@@ -292,7 +430,7 @@ async def forgot_password(
 
 # --- Reset Password Endpoint ---
 @router.post("/reset-password")
-async def reset_password(
+def reset_password(
     request: ResetPasswordRequest,
     session: Session = Depends(get_session)
 ):
@@ -313,15 +451,6 @@ async def reset_password(
             detail="Invalid or expired reset token. Please request a new password reset."
         )
     
-    # Find the user
-    user = session.exec(select(User).where(User.email == email)).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired reset token. Please request a new password reset."
-        )
-    
     # Validate new password (basic validation - you can make this stricter)
     if len(request.new_password) < 8:
         raise HTTPException(
@@ -329,10 +458,22 @@ async def reset_password(
             detail="Password must be at least 8 characters long."
         )
     
-    # Update the password
-    user.hashed_password = hash_password(request.new_password)
-    session.add(user)
+    # Update the password with one UPDATE instead of loading the whole row
+    # first; no matching row means the account no longer exists.
+    username = session.exec(
+        update(User)
+        .where(User.email == email)
+        .values(hashed_password=hash_password(request.new_password))
+        .returning(User.username)
+    ).scalar_one_or_none()
+    if username is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired reset token. Please request a new password reset."
+        )
     session.commit()
+    # Like every other write to a user row, drop the cached copy
+    invalidate_cached_user(username)
     
     return {
         "message": "Password has been reset successfully. You can now log in with your new password."
@@ -352,7 +493,7 @@ class ResendVerificationRequest(BaseModel):
 
 # --- Verify Email Endpoint ---
 @router.post("/verify-email")
-async def verify_email(
+def verify_email(
     request: VerifyEmailRequest,
     session: Session = Depends(get_session)
 ):
@@ -373,25 +514,29 @@ async def verify_email(
             detail="Invalid or expired verification link. Please request a new verification email."
         )
     
-    # Find the user
-    user = session.exec(select(User).where(User.email == email)).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired verification link. Please request a new verification email."
-        )
-    
-    # Check if already verified
-    if user.email_verified:
+    # Mark email as verified in one UPDATE ... RETURNING. It only matches an
+    # unverified user, so no row back means "already verified" or "gone".
+    username = session.exec(
+        update(User)
+        .where(User.email == email, User.email_verified.is_(False))
+        .values(email_verified=True)
+        .returning(User.username)
+    ).scalar_one_or_none()
+    
+    if username is None:
+        # Rare path: tell the two cases apart
+        if session.exec(select(User.id).where(User.email == email)).first() is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired verification link. Please request a new verification email."
+            )
         return {
             "message": "Email is already verified. You can log in to your account."
         }
     
-    # Mark email as verified
-    user.email_verified = True
-    session.add(user)
     session.commit()
+    # email_verified is part of the cached current_user, so drop the stale copy
+    invalidate_cached_user(username)
     
     return {
         "message": "Email verified successfully! You can now log in to your account."
@@ -400,8 +545,9 @@ async def verify_email(
 
 # --- Resend Verification Email Endpoint ---
 @router.post("/resend-verification")
-async def resend_verification_email(
+def resend_verification_email(
     request: ResendVerificationRequest,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session)
 ):
     """
@@ -410,18 +556,20 @@ async def resend_verification_email(
     For security, always returns success even if email doesn't exist
     (prevents email enumeration attacks).
     """
-    # Find user by email
-    user = session.exec(select(User).where(User.email == request.email)).first()
+    # Find user by email - just the fields the email needs (skipped if a
+    # link went to this address moments ago)
+    user = None
+    if not _email_request_throttled("verification", request.email):
+        user = session.exec(
+            select(User.email, User.first_name, User.email_verified).where(User.email == request.email)
+        ).first()
     
     if user and not user.email_verified:
         # Generate new verification token
         verification_token = create_email_verification_token(user.email)
         
-        # Send the verification email
-        email_sent = send_verification_email(user.email, verification_token, user.first_name)
-        
-        if not email_sent:
-            print(f"Failed to send verification email to {user.email}")
+        # Send the verification email after responding (send_email logs failures)
+        background_tasks.add_task(send_verification_email, user.email, verification_token, user.first_name)
     
     # Always return success to prevent email enumeration
     return {
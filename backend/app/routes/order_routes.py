@@ -10,17 +10,19 @@ Key endpoints:
 - PUT /orders/{order_id}/status - Update order status (restaurant staff)
 """
 
+from datetime import datetime
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
 from sqlmodel import Session, select
+from sqlalchemy import tuple_
 from sqlalchemy.orm import selectinload
 
 from ..db.session import get_session
-from ..models.order import Order, OrderCreate, OrderRead, OrderItem, OrderItemRead, OrderUpdate
+from ..models.order import _ZERO, Order, OrderCreate, OrderRead, OrderItem, OrderItemRead, OrderUpdate
 from ..models.recipe import Recipe
 from ..models.restaurant import Restaurant, ApprovalStatus
 from ..models.user import User
-from ..models.enums import SystemRole, OrderStatus
+from ..models.enums import SystemRole, OrderStatus, CANCELLABLE_ORDER_STATUSES, ORDER_STATUS_TRANSITIONS
 from ..utilities.auth import get_current_user
 from .websocket_routes import notify_new_order, notify_order_status_change
 
@@ -33,17 +35,45 @@ router = APIRouter(prefix="/orders", tags=["Orders"])
 
 def calculate_order_total(items: list[OrderItem]) -> Decimal:
     """Calculate the total amount for an order from its items."""
-    return sum(item.subtotal for item in items)
+    # Start from the model's 0.00 (not the default int 0) so even an empty
+    # order totals to a 2-place Decimal
+    return sum((item.subtotal for item in items), _ZERO)
+
+
+def apply_order_cursor(query, cursor: datetime | None, cursor_id: int | None):
+    """
+    Restrict an order query (sorted newest first) to the page after a cursor.
+    
+    The cursor is the last order of the previous page as (created_at, id).
+    created_at alone isn't unique - now() is per transaction, so orders can
+    share a timestamp - and a plain `created_at < :cursor` would silently skip
+    the rest of a tie. Comparing the (created_at, id) pair, with id as the
+    ORDER BY tiebreak, picks up exactly where the previous page stopped.
+    """
+    if cursor is None and cursor_id is None:
+        return query
+    if cursor is None or cursor_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor and cursor_id must be given together"
+        )
+    return query.where(tuple_(Order.created_at, Order.id) < tuple_(cursor, cursor_id))
 
 
 def order_to_read_model(order: Order, include_restaurant_name: bool = False) -> OrderRead:
-    """Convert Order database model to OrderRead response model."""
+    """
+    Convert Order database model to OrderRead response model.
+    
+    Uses model_construct() because the data comes straight from trusted
+    database rows - re-running validation on every order and every item
+    is wasted work (and it grows with the number of items).
+    """
     # Get restaurant name if requested and restaurant is loaded
     restaurant_name = None
     if include_restaurant_name and order.restaurant is not None:
         restaurant_name = order.restaurant.restaurant_name
     
-    return OrderRead(
+    return OrderRead.model_construct(
         id=order.id,
         customer_id=order.customer_id,
         restaurant_id=order.restaurant_id,
@@ -54,7 +84,7 @@ def order_to_read_model(order: Order, include_restaurant_name: bool = False) ->
         created_at=order.created_at,
         updated_at=order.updated_at,
         items=[
-            OrderItemRead(
+            OrderItemRead.model_construct(
                 id=item.id,
                 recipe_id=item.recipe_id,
                 quantity=item.quantity,
@@ -72,7 +102,7 @@ def order_to_read_model(order: Order, include_restaurant_name: bool = False) ->
 # =============================================================================
 
 @router.post("/", response_model=OrderRead, status_code=status.HTTP_201_CREATED)
-async def create_order(
+def create_order(
     order_data: OrderCreate,
     background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
@@ -97,9 +127,7 @@ async def create_order(
         )
     
     # Step 2: Validate restaurant exists and is approved
-    restaurant = session.exec(
-        select(Restaurant).where(Restaurant.id == order_data.restaurant_id)
-    ).first()
+    restaurant = session.get(Restaurant, order_data.restaurant_id)
     
     if not restaurant:
         raise HTTPException(
@@ -120,56 +148,55 @@ async def create_order(
             detail="Order must contain at least one item"
         )
     
-    order_items: list[OrderItem] = []
-    
-    for item_data in order_data.items:
-        # Get the recipe
-        recipe = session.exec(
-            select(Recipe).where(
-                Recipe.id == item_data.recipe_id,
+    # Fetch every ordered recipe in ONE query (instead of one per line item).
+    # Only id and price are needed, so don't pull the (potentially large)
+    # ingredients/instructions JSON columns.
+    recipe_ids = [item_data.recipe_id for item_data in order_data.items]
+    prices = dict(
+        session.exec(
+            select(Recipe.id, Recipe.price).where(
+                Recipe.id.in_(recipe_ids),
                 Recipe.restaurant_id == order_data.restaurant_id
             )
-        ).first()
-        
-        if not recipe:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Recipe with id {item_data.recipe_id} not found in this restaurant"
-            )
-        
-        # Create order item with price at time of order
-        subtotal = recipe.price * item_data.quantity
-        order_item = OrderItem(
-            recipe_id=recipe.id,
+        ).all()
+    )
+    
+    missing_ids = [recipe_id for recipe_id in dict.fromkeys(recipe_ids) if recipe_id not in prices]
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Recipes not found in this restaurant: {', '.join(map(str, missing_ids))}"
+        )
+    
+    # Create order items with the price at time of order
+    order_items = [
+        OrderItem(
+            recipe_id=item_data.recipe_id,
             quantity=item_data.quantity,
-            unit_price=recipe.price,
-            subtotal=subtotal,
+            unit_price=prices[item_data.recipe_id],
+            subtotal=prices[item_data.recipe_id] * item_data.quantity,
             notes=item_data.notes
         )
-        order_items.append(order_item)
-    
-    # Step 4: Create the order
-    total_amount = calculate_order_total(order_items)
-    
+        for item_data in order_data.items
+    ]
+    
+    # Step 4: Create the order together with its items and commit ONCE.
+    # Passing items= sets order_id on every item when the order is flushed,
+    # and on PostgreSQL SQLAlchemy sends the items as one multi-row INSERT. One
+    # transaction means no window where an order exists without its items.
+    # No refresh: id and timestamps come back via INSERT ... RETURNING
+    # (eager_defaults), and order.items is already the in-memory list.
     new_order = Order(
         customer_id=current_user.id,
         restaurant_id=order_data.restaurant_id,
         status=OrderStatus.PENDING,
-        total_amount=total_amount,
-        notes=order_data.notes
+        total_amount=calculate_order_total(order_items),
+        notes=order_data.notes,
+        items=order_items
     )
     
     session.add(new_order)
     session.commit()
-    session.refresh(new_order)
-    
-    # Step 5: Add items to the order (now that we have the order ID)
-    for item in order_items:
-        item.order_id = new_order.id
-        session.add(item)
-    
-    session.commit()
-    session.refresh(new_order)
     
     # Convert to read model for response
     order_read = order_to_read_model(new_order)
@@ -178,20 +205,30 @@ async def create_order(
     background_tasks.add_task(
         notify_new_order,
         order_data.restaurant_id,
-        order_read.model_dump(mode='json')
+        order_read
     )
     
     return order_read
 
 
 @router.get("/", response_model=list[OrderRead])
-async def get_my_orders(
+def get_my_orders(
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of orders to return (default: all of them)"),
+    cursor: datetime | None = Query(None, description="created_at of the last order of the previous page"),
+    cursor_id: int | None = Query(None, description="id of the last order of the previous page"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all orders for the current customer.
-    Returns orders sorted by most recent first, includes restaurant name.
+    Get the current customer's orders, most recent first, with restaurant name.
+    
+    Keyset pagination: pass `limit`, then the last order's `created_at` and
+    `id` you received as `cursor` and `cursor_id` to get the next (older) page.
+    Paging is opt-in - without `limit` every order comes back, since the
+    orders page reads the history in one request. The
+    `(created_at, id) < (:cursor, :cursor_id)` condition walks the
+    (customer_id, created_at, id) index straight to the next page, so each page
+    costs the same no matter how long the order history is.
     """
     if current_user.role != SystemRole.CUSTOMER:
         raise HTTPException(
@@ -199,18 +236,22 @@ async def get_my_orders(
             detail="Only customers can view their orders"
         )
     
-    orders = session.exec(
+    query = (
         select(Order)
         .where(Order.customer_id == current_user.id)
         .options(selectinload(Order.restaurant), selectinload(Order.items))
-        .order_by(Order.created_at.desc())
-    ).all()
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(limit)
+    )
+    query = apply_order_cursor(query, cursor, cursor_id)
+    
+    orders = session.exec(query).all()
     
     return [order_to_read_model(order, include_restaurant_name=True) for order in orders]
 
 
 @router.get("/{order_id}", response_model=OrderRead)
-async def get_order(
+def get_order(
     order_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
@@ -221,9 +262,9 @@ async def get_order(
     Customers can only view their own orders.
     Restaurant staff can view orders for their restaurant.
     """
-    order = session.exec(
-        select(Order).where(Order.id == order_id)
-    ).first()
+    # Primary-key lookup via the identity map (Order.items is selectin-loaded
+    # by the relationship itself)
+    order = session.get(Order, order_id)
     
     if not order:
         raise HTTPException(
@@ -249,9 +290,12 @@ async def get_order(
 # =============================================================================
 
 @router.get("/restaurant/{restaurant_id}", response_model=list[OrderRead])
-async def get_restaurant_orders(
+def get_restaurant_orders(
     restaurant_id: int,
     status_filter: OrderStatus | None = None,
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of orders to return (default: all of them)"),
+    cursor: datetime | None = Query(None, description="created_at of the last order of the previous page"),
+    cursor_id: int | None = Query(None, description="id of the last order of the previous page"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -260,16 +304,22 @@ async def get_restaurant_orders(
     
     This endpoint is for restaurant staff to view incoming orders.
     Optional status filter to show only orders in a specific state.
+    Newest first; pass `limit`/`cursor`/`cursor_id` to page, like GET /orders.
     
     TODO: Add proper RBAC to verify user is staff of this restaurant
     """
     # Build query
-    query = select(Order).where(Order.restaurant_id == restaurant_id)
+    query = (
+        select(Order)
+        .where(Order.restaurant_id == restaurant_id)
+        .options(selectinload(Order.items))
+    )
     
     if status_filter:
         query = query.where(Order.status == status_filter)
+    query = apply_order_cursor(query, cursor, cursor_id)
     
-    query = query.order_by(Order.created_at.desc())
+    query = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit)
     
     orders = session.exec(query).all()
     
@@ -277,7 +327,7 @@ async def get_restaurant_orders(
 
 
 @router.put("/{order_id}/status", response_model=OrderRead)
-async def update_order_status(
+def update_order_status(
     order_id: int,
     update_data: OrderUpdate,
     background_tasks: BackgroundTasks,
@@ -296,9 +346,9 @@ async def update_order_status(
     
     TODO: Add proper RBAC and status transition validation
     """
-    order = session.exec(
-        select(Order).where(Order.id == order_id)
-    ).first()
+    # Primary-key lookup via the identity map (Order.items is selectin-loaded
+    # by the relationship itself)
+    order = session.get(Order, order_id)
     
     if not order:
         raise HTTPException(
@@ -308,16 +358,12 @@ async def update_order_status(
     
     # Validate status transitions
     if update_data.status:
-        valid_transitions = {
-            OrderStatus.PENDING: [OrderStatus.PAID, OrderStatus.CANCELLED],
-            OrderStatus.PAID: [OrderStatus.PREPARING, OrderStatus.CANCELLED],
-            OrderStatus.PREPARING: [OrderStatus.READY],
-            OrderStatus.READY: [OrderStatus.COMPLETED],
-            OrderStatus.COMPLETED: [],  # Terminal state
-            OrderStatus.CANCELLED: [],  # Terminal state
-        }
+        if update_data.status == OrderStatus.CANCELLED:
+            allowed = order.status in CANCELLABLE_ORDER_STATUSES
+        else:
+            allowed = update_data.status in ORDER_STATUS_TRANSITIONS.get(order.status, ())
         
-        if update_data.status not in valid_transitions.get(order.status, []):
+        if not allowed:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot transition from {order.status.value} to {update_data.status.value}"
@@ -328,9 +374,10 @@ async def update_order_status(
     if update_data.notes is not None:
         order.notes = update_data.notes
     
+    # No refresh needed: the UPDATE returns the new updated_at (eager_defaults)
+    # and the items were loaded with the order
     session.add(order)
     session.commit()
-    session.refresh(order)
     
     # Convert to read model for response
     order_read = order_to_read_model(order)
@@ -339,7 +386,7 @@ async def update_order_status(
     background_tasks.add_task(
         notify_order_status_change,
         order.customer_id,
-        order_read.model_dump(mode='json')
+        order_read
     )
     
     return order_read
@@ -16,17 +16,27 @@ Key Concepts:
 - Webhook Secret: Used to verify the webhook really came from Stripe (not a hacker)
 """
 
+import logging
+
 import stripe
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Session, select
 
 from ..db.session import get_session
 from ..models.order import Order
 from ..models.enums import OrderStatus
+from ..models.webhook_event import ProcessedWebhookEvent
 from ..utilities.auth import get_current_user
+from .order_routes import order_to_read_model
+from .websocket_routes import notify_order_status_change
 from ..models.user import User
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/payments", tags=["Payments"])
 
 # Configure Stripe with API key from centralized settings
@@ -38,12 +48,16 @@ stripe.api_key = settings.STRIPE_SECRET_KEY
 # Get this from Stripe Dashboard > Webhooks > Signing secret
 WEBHOOK_SECRET = settings.STRIPE_WEBHOOK_SECRET
 
+# Largest webhook body we'll read. Stripe event payloads are a few KB
+# (well under this), so anything bigger isn't a genuine event.
+MAX_WEBHOOK_PAYLOAD_SIZE = 1024 * 1024  # 1MB
+
 # Frontend URLs for redirect after payment
 FRONTEND_URL = settings.FRONTEND_URL
 
 
 @router.post("/create-checkout-session")
-async def create_checkout_session(
+def create_checkout_session(
     order_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
@@ -135,9 +149,65 @@ async def create_checkout_session(
         )
 
 
+async def _raw_body(request: Request) -> bytes:
+    """
+    The raw request body, exactly as Stripe signed it.
+
+    Reading the body has to be awaited, so it happens in this dependency;
+    the webhook itself is a plain `def` and runs in the threadpool.
+
+    Unsigned requests are turned away before anything is read, and the body
+    is capped at MAX_WEBHOOK_PAYLOAD_SIZE, so a spoofed request can't make us
+    buffer an arbitrarily large payload.
+    """
+    if "stripe-signature" not in request.headers:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Missing stripe-signature header"
+        )
+    
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail="Payload too large"
+    )
+    # Cheap early reject when the client declares the size up front...
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_WEBHOOK_PAYLOAD_SIZE:
+        raise too_large
+    
+    # ...and enforce the cap while reading, for chunked uploads
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_WEBHOOK_PAYLOAD_SIZE:
+            raise too_large
+    return bytes(body)
+
+
+def _claim_webhook_event(session: Session, event_id: str) -> bool:
+    """
+    Record a Stripe event as handled. Returns False if it already was.
+    
+    INSERT ... ON CONFLICT DO NOTHING on the event_id primary key: a retry
+    inserts nothing (rowcount 0). If two deliveries of the same event race,
+    PostgreSQL makes the second INSERT wait for the first transaction, then
+    skip. The row is committed together with the order update, so an event
+    whose processing failed is not marked handled and Stripe's retry runs it.
+    """
+    insert = sqlite_insert if session.get_bind().dialect.name == "sqlite" else postgresql_insert
+    result = session.exec(
+        insert(ProcessedWebhookEvent)
+        .values(event_id=event_id)
+        .on_conflict_do_nothing(index_elements=["event_id"])
+    )
+    return result.rowcount == 1
+
+
 @router.post("/webhook")
-async def stripe_webhook(
+def stripe_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
+    payload: bytes = Depends(_raw_body),
     session: Session = Depends(get_session)
 ):
     """
@@ -155,17 +225,12 @@ async def stripe_webhook(
     1. Receive webhook from Stripe
     2. Verify signature using webhook secret
     3. Parse the event
-    4. If checkout completed, mark order as PAID
+    4. Skip events we've already handled (Stripe retries deliveries)
+    5. If checkout completed, mark order as PAID
+    6. Respond 200, then notify the customer (background task)
     """
-    # Get the raw request body (needed for signature verification)
-    payload = await request.body()
-    sig_header = request.headers.get("stripe-signature")
-    
-    if not sig_header:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing stripe-signature header"
-        )
+    # Presence was already checked by _raw_body, before the body was read
+    sig_header = request.headers["stripe-signature"]
     
     # Verify the webhook signature
     try:
@@ -185,6 +250,11 @@ async def stripe_webhook(
             detail="Invalid signature"
         )
     
+    # Stripe may deliver the same event more than once - acknowledge repeats
+    # with a 200 (so Stripe stops retrying) without processing them again
+    if not _claim_webhook_event(session, event["id"]):
+        return {"status": "duplicate"}
+    
     # Handle the event
     if event["type"] == "checkout.session.completed":
         # Payment was successful!
@@ -194,27 +264,40 @@ async def stripe_webhook(
         order_id = checkout_session.get("metadata", {}).get("order_id")
         
         if order_id:
-            # Update the order status to PAID
+            # Mark the order PAID with one conditional UPDATE: the status
+            # check happens in the WHERE clause, so there's no SELECT first
+            # and no window for a concurrent change to slip in between.
+            # This stays in the request (same transaction as the event
+            # claim): if it were deferred and then failed, the claimed event
+            # would stop Stripe's retries and the payment would be lost.
             order = session.exec(
-                select(Order).where(Order.id == int(order_id))
-            ).first()
+                update(Order)
+                .where(Order.id == int(order_id), Order.status == OrderStatus.PENDING)
+                .values(status=OrderStatus.PAID)
+                .returning(Order)
+            ).scalar_one_or_none()
             
-            if order and order.status == OrderStatus.PENDING:
-                order.status = OrderStatus.PAID
-                session.add(order)
-                session.commit()
-                
-                # TODO: Send WebSocket notification to restaurant
+            if order is not None:
+                # Side effects run after Stripe has its 200 (in background)
+                paid_order = order_to_read_model(order)
+                background_tasks.add_task(
+                    notify_order_status_change,
+                    order.customer_id,
+                    paid_order
+                )
                 # TODO: Send confirmation email to customer
                 
-                print(f"✅ Order #{order_id} marked as PAID")
+                logger.info("Order #%s marked as PAID", order_id)
     
     elif event["type"] == "payment_intent.payment_failed":
         # Payment failed
         payment_intent = event["data"]["object"]
-        print(f"❌ Payment failed: {payment_intent.get('id')}")
+        logger.warning("Payment failed: %s", payment_intent.get("id"))
         # Could send notification to customer
     
+    # One commit for the event record and any order change
+    session.commit()
+    
     # Return 200 to acknowledge receipt
     # If we don't return 200, Stripe will retry the webhook
     return {"status": "success"}
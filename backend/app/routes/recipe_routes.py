@@ -1,5 +1,5 @@
 from sqlmodel import Session, select
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from ..utilities.rbac import require_edit_menu_access, require_read_restaurant_access
 
@@ -11,14 +11,39 @@ from ..models.recipe import Recipe, RecipeCreate, RecipeRead, RecipeUpdate
 router = APIRouter(prefix="/recipes", tags=["Recipes"])
 
 
+def _list_recipes(session: Session, restaurant_id: int, limit: int | None, cursor: int | None) -> list[Recipe]:
+    """
+    A restaurant's recipes, ordered by ID - all of them, or one page.
+    
+    Keyset pagination: `WHERE id > :cursor` seeks straight to the next page
+    instead of scanning past OFFSET rows, and `limit` bounds the memory and
+    serialization cost of a response. Without `limit` the whole menu comes
+    back, because the frontend's menu page reads it in one request.
+    """
+    query = (
+        select(Recipe)
+        .where(Recipe.restaurant_id == restaurant_id)
+        .order_by(Recipe.id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        query = query.where(Recipe.id > cursor)
+    return session.exec(query).all()
+
+
 @router.get("/public/{restaurant_id}", response_model=list[RecipeRead])
-async def get_public_menu(
+def get_public_menu(
     restaurant_id: int,
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of recipes to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return recipes with an ID greater than this (the last ID of the previous page)"),
     session: Session = Depends(get_session)
 ):
     """
-    Public endpoint: Fetches all recipes (menu items) for an approved restaurant.
+    Public endpoint: Fetches the recipes (menu items) of an approved restaurant.
     No authentication required - customers can browse menus without logging in.
+    
+    Results are ordered by ID. Pass `limit` to page through them, with the
+    last `id` received as `cursor` for the next page.
     """
     # Verify the restaurant exists and is approved
     restaurant = session.exec(
@@ -34,13 +59,10 @@ async def get_public_menu(
             detail="Restaurant not found or not available"
         )
     
-    recipes = session.exec(
-        select(Recipe).where(Recipe.restaurant_id == restaurant_id)
-    ).all()
-    return recipes
+    return _list_recipes(session, restaurant_id, limit, cursor)
 
 @router.post("/", response_model=Recipe, status_code=status.HTTP_201_CREATED)
-async def create_recipe(
+def create_recipe(
     restaurant_id: int,
     recipe: RecipeCreate, 
     session: Session = Depends(get_session), 
@@ -61,24 +83,23 @@ async def create_recipe(
     return new_recipe
 
 @router.get("/", response_model=list[RecipeRead])
-async def get_recipes(
+def get_recipes(
     restaurant_id: int,
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of recipes to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return recipes with an ID greater than this (the last ID of the previous page)"),
     session: Session = Depends(get_session),
     current_user: User = Depends(require_read_restaurant_access())
 ):
     """
-    Fetches all recipes for a specific restaurant.
+    Fetches the recipes of a specific restaurant (optionally a page at a time).
     The restaurant_id query parameter is used for both access control and filtering.
     """
     # Access control is handled by require_read_restaurant_access()
     # which checks if the user has permission to access this restaurant
-    recipes = session.exec(
-        select(Recipe).where(Recipe.restaurant_id == restaurant_id)
-    ).all()
-    return recipes
+    return _list_recipes(session, restaurant_id, limit, cursor)
 
 @router.get("/{recipe_id}", response_model=RecipeRead)
-async def get_recipe(
+def get_recipe(
     recipe_id: int,
     restaurant_id: int,
     session: Session = Depends(get_session),
@@ -103,7 +124,7 @@ async def get_recipe(
     return recipe
 
 @router.put("/{recipe_id}", response_model=Recipe)
-async def update_recipe(recipe_id: int, updated_recipe: RecipeUpdate, session: Session = Depends(get_session), current_user: User = Depends(require_edit_menu_access())):
+def update_recipe(recipe_id: int, updated_recipe: RecipeUpdate, session: Session = Depends(get_session), current_user: User = Depends(require_edit_menu_access())):
     """
     Updates a recipe's information in the database.
     """
@@ -114,13 +135,13 @@ async def update_recipe(recipe_id: int, updated_recipe: RecipeUpdate, session: S
     for key, value in updated_recipe.model_dump(exclude_unset=True).items():
         setattr(existing_recipe, key, value)
 
+    # No refresh needed: the UPDATE returns the new updated_at (eager_defaults)
     session.add(existing_recipe)
     session.commit()
-    session.refresh(existing_recipe)
     return existing_recipe
 
 @router.delete("/{recipe_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_recipe(recipe_id: int, session: Session = Depends(get_session), current_user: User = Depends(require_edit_menu_access())):
+def delete_recipe(recipe_id: int, session: Session = Depends(get_session), current_user: User = Depends(require_edit_menu_access())):
     """
     Deletes a recipe by ID from the database.
     """
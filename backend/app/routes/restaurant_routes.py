@@ -1,4 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Session, select
 
 from ..utilities.auth import get_current_user
@@ -10,12 +15,23 @@ from ..models.membership import Membership
 from ..models.user import SystemRole, User
 from ..config import settings
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/restaurants", tags=["Restaurants"])
 
+# The list endpoints below can be paginated by ID (keyset pagination): pass
+# `limit`, then the last `id` received as `cursor` to get the next page.
+# `WHERE id > :cursor` seeks straight to the next page instead of scanning
+# past OFFSET rows, and `limit` bounds the memory and serialization cost of
+# a response. Paging is opt-in: without `limit` the whole list comes back,
+# since the frontend pages (home, menu, dashboards) read each list in one
+# request and would otherwise silently lose everything past the first page.
+
 
 @router.get("/my", response_model=list[Restaurant])
-async def get_my_restaurants(
+def get_my_restaurants(
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of restaurants to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return restaurants with an ID greater than this (the last ID of the previous page)"),
     session: Session = Depends(get_session), 
     current_user: User = Depends(get_current_user)
 ):
@@ -23,25 +39,25 @@ async def get_my_restaurants(
     Get all restaurants the current user has membership to.
     Returns restaurants based on the user's memberships.
     """
-    # Get user's memberships with restaurant IDs
-    memberships = session.exec(
-        select(Membership).where(Membership.user_id == current_user.id)
-    ).all()
-    
-    if not memberships:
-        return []
-    
-    # Get all restaurants for these memberships
-    restaurant_ids = [m.restaurant_id for m in memberships]
-    restaurants = session.exec(
-        select(Restaurant).where(Restaurant.id.in_(restaurant_ids))
-    ).all()
+    # Join through the membership table so the user's restaurants come back
+    # in a single round trip instead of "fetch memberships, then fetch restaurants".
+    # current_user is a detached column snapshot (see get_current_user), so we
+    # query by its ID rather than walking current_user.memberships.
+    query = (
+        select(Restaurant)
+        .join(Membership, Membership.restaurant_id == Restaurant.id)
+        .where(Membership.user_id == current_user.id)
+        .order_by(Restaurant.id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        query = query.where(Restaurant.id > cursor)
     
-    return restaurants
+    return session.exec(query).all()
 
 
 @router.post("/", response_model=Restaurant, status_code=status.HTTP_201_CREATED)
-async def create_restaurant(restaurant: RestaurantCreate, session: Session = Depends(get_session), current_user: User = Depends(require_restaurant_creation_access())):
+def create_restaurant(restaurant: RestaurantCreate, session: Session = Depends(get_session), current_user: User = Depends(require_restaurant_creation_access())):
     """
     Creates a new restaurant in the database.
     """
@@ -53,10 +69,12 @@ async def create_restaurant(restaurant: RestaurantCreate, session: Session = Dep
 
 
 @router.get("/approved", response_model=list[Restaurant])
-async def get_approved_restaurants(
+def get_approved_restaurants(
     session: Session = Depends(get_session),
     search: str | None = None,
-    cuisine: str | None = None
+    cuisine: str | None = None,
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of restaurants to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return restaurants with an ID greater than this (the last ID of the previous page)")
 ):
     """
     Public endpoint: Fetches all approved restaurants.
@@ -65,8 +83,17 @@ async def get_approved_restaurants(
     Query Parameters:
     - search: Search by restaurant name (case-insensitive partial match)
     - cuisine: Filter by cuisine type (case-insensitive partial match)
+    - limit / cursor: Page through the results by ID
     """
-    query = select(Restaurant).where(Restaurant.approval_status == ApprovalStatus.APPROVED)
+    query = (
+        select(Restaurant)
+        .where(Restaurant.approval_status == ApprovalStatus.APPROVED)
+        .order_by(Restaurant.id)
+        .limit(limit)
+    )
+    
+    if cursor is not None:
+        query = query.where(Restaurant.id > cursor)
     
     if search:
         query = query.where(Restaurant.restaurant_name.ilike(f"%{search}%"))
@@ -79,7 +106,7 @@ async def get_approved_restaurants(
 
 
 @router.get("/approved/{restaurant_id}", response_model=Restaurant)
-async def get_approved_restaurant(
+def get_approved_restaurant(
     restaurant_id: int,
     session: Session = Depends(get_session)
 ):
@@ -104,15 +131,22 @@ async def get_approved_restaurant(
 
 
 @router.get("/", response_model=list[Restaurant])
-async def get_restaurants(session: Session = Depends(get_session), current_user: User = Depends(require_system_roles(SystemRole.SUPERADMIN))):
+def get_restaurants(
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of restaurants to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return restaurants with an ID greater than this (the last ID of the previous page)"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(require_system_roles(SystemRole.SUPERADMIN))
+):
     """
-    Fetches all restaurants from the database.
+    Fetches restaurants from the database, optionally a page at a time.
     """
-    restaurants = session.exec(select(Restaurant)).all()
-    return restaurants
+    query = select(Restaurant).order_by(Restaurant.id).limit(limit)
+    if cursor is not None:
+        query = query.where(Restaurant.id > cursor)
+    return session.exec(query).all()
 
 @router.get("/{restaurant_id}", response_model=Restaurant)
-async def get_restaurant(restaurant_id: int, session: Session = Depends(get_session), current_user: User = Depends(require_read_restaurant_access())):
+def get_restaurant(restaurant_id: int, session: Session = Depends(get_session), current_user: User = Depends(require_read_restaurant_access())):
     """
     Fetches a restaurant by ID from the database.
     """
@@ -122,7 +156,7 @@ async def get_restaurant(restaurant_id: int, session: Session = Depends(get_sess
     return restaurant
 
 @router.put("/{restaurant_id}", response_model=Restaurant)
-async def update_restaurant(restaurant_id: int, updated_restaurant: RestaurantUpdate, session: Session = Depends(get_session), current_user: User = Depends(require_manage_restaurant_access())):
+def update_restaurant(restaurant_id: int, updated_restaurant: RestaurantUpdate, session: Session = Depends(get_session), current_user: User = Depends(require_manage_restaurant_access())):
     """
     Updates a restaurant's information in the database.
     """
@@ -133,13 +167,13 @@ async def update_restaurant(restaurant_id: int, updated_restaurant: RestaurantUp
     for key, value in updated_restaurant.model_dump(exclude_unset=True).items():
         setattr(existing_restaurant, key, value)
 
+    # No refresh needed: the UPDATE returns the new updated_at (eager_defaults)
     session.add(existing_restaurant)
     session.commit()
-    session.refresh(existing_restaurant)
     return existing_restaurant
 
 @router.delete("/{restaurant_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_restaurant(restaurant_id: int, session: Session = Depends(get_session), current_user: User = Depends(require_manage_restaurant_access())):
+def delete_restaurant(restaurant_id: int, session: Session = Depends(get_session), current_user: User = Depends(require_manage_restaurant_access())):
     """
     Deletes a restaurant by ID from the database.
     """
@@ -154,22 +188,48 @@ async def delete_restaurant(restaurant_id: int, session: Session = Depends(get_s
 
 # ==================== Admin Endpoints ====================
 
+def _set_approval_status(session: Session, restaurant_id: int, new_status: ApprovalStatus) -> Restaurant:
+    """
+    Set a restaurant's approval status with one UPDATE ... RETURNING.
+    
+    The returned row already carries the new updated_at, so there's no
+    SELECT before the write and no refresh after it.
+    """
+    restaurant = session.exec(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .values(approval_status=new_status)
+        .returning(Restaurant)
+    ).scalar_one_or_none()
+    if restaurant is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found")
+    session.commit()
+    return restaurant
+
+
 @router.get("/admin/pending", response_model=list[Restaurant])
-async def get_pending_restaurants(
+def get_pending_restaurants(
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of restaurants to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return restaurants with an ID greater than this (the last ID of the previous page)"),
     session: Session = Depends(get_session), 
     current_user: User = Depends(require_system_roles(SystemRole.SUPERADMIN))
 ):
     """
-    Admin only: Get all restaurants awaiting approval.
+    Admin only: Get restaurants awaiting approval, optionally a page at a time.
     """
-    restaurants = session.exec(
-        select(Restaurant).where(Restaurant.approval_status == ApprovalStatus.PENDING)
-    ).all()
-    return restaurants
+    query = (
+        select(Restaurant)
+        .where(Restaurant.approval_status == ApprovalStatus.PENDING)
+        .order_by(Restaurant.id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        query = query.where(Restaurant.id > cursor)
+    return session.exec(query).all()
 
 
 @router.post("/{restaurant_id}/approve", response_model=Restaurant)
-async def approve_restaurant(
+def approve_restaurant(
     restaurant_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_system_roles(SystemRole.SUPERADMIN))
@@ -177,19 +237,11 @@ async def approve_restaurant(
     """
     Admin only: Approve a restaurant registration.
     """
-    restaurant = session.exec(select(Restaurant).where(Restaurant.id == restaurant_id)).first()
-    if not restaurant:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found")
-    
-    restaurant.approval_status = ApprovalStatus.APPROVED
-    session.add(restaurant)
-    session.commit()
-    session.refresh(restaurant)
-    return restaurant
+    return _set_approval_status(session, restaurant_id, ApprovalStatus.APPROVED)
 
 
 @router.post("/{restaurant_id}/reject", response_model=Restaurant)
-async def reject_restaurant(
+def reject_restaurant(
     restaurant_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_system_roles(SystemRole.SUPERADMIN))
@@ -197,19 +249,11 @@ async def reject_restaurant(
     """
     Admin only: Reject a restaurant registration.
     """
-    restaurant = session.exec(select(Restaurant).where(Restaurant.id == restaurant_id)).first()
-    if not restaurant:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found")
-    
-    restaurant.approval_status = ApprovalStatus.REJECTED
-    session.add(restaurant)
-    session.commit()
-    session.refresh(restaurant)
-    return restaurant
+    return _set_approval_status(session, restaurant_id, ApprovalStatus.REJECTED)
 
 
 @router.post("/{restaurant_id}/suspend", response_model=Restaurant)
-async def suspend_restaurant(
+def suspend_restaurant(
     restaurant_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_system_roles(SystemRole.SUPERADMIN))
@@ -217,15 +261,7 @@ async def suspend_restaurant(
     """
     Admin only: Suspend a restaurant.
     """
-    restaurant = session.exec(select(Restaurant).where(Restaurant.id == restaurant_id)).first()
-    if not restaurant:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found")
-    
-    restaurant.approval_status = ApprovalStatus.SUSPENDED
-    session.add(restaurant)
-    session.commit()
-    session.refresh(restaurant)
-    return restaurant
+    return _set_approval_status(session, restaurant_id, ApprovalStatus.SUSPENDED)
 
 
 # ==================== Membership Management ====================
@@ -254,36 +290,46 @@ class InviteStaffRequest(BaseModel):
 
 
 @router.get("/{restaurant_id}/memberships", response_model=list[MembershipResponse])
-async def get_memberships(
+def get_memberships(
     restaurant_id: int,
+    limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of memberships to return (default: all of them)"),
+    cursor: int | None = Query(None, description="Return memberships with an ID greater than this (the last ID of the previous page)"),
     session: Session = Depends(get_session),
     current_user: User = Depends(require_manage_restaurant_access())
 ):
     """
-    Get all memberships for a restaurant.
+    Get a restaurant's memberships, optionally a page at a time.
     Only restaurant admins and system admins can view memberships.
     """
-    memberships = session.exec(
-        select(Membership).where(Membership.restaurant_id == restaurant_id)
-    ).all()
+    # One JOIN brings back each membership with just the user columns the
+    # response needs - a single round trip, however many members there are.
+    # user_id is a non-null foreign key, so the inner join drops no rows.
+    query = (
+        select(Membership, User.email, User.first_name, User.last_name)
+        .join(User, User.id == Membership.user_id)
+        .where(Membership.restaurant_id == restaurant_id)
+        .order_by(Membership.id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        query = query.where(Membership.id > cursor)
+    rows = session.exec(query).all()
     
-    result = []
-    for m in memberships:
-        user = session.exec(select(User).where(User.id == m.user_id)).first()
-        result.append(MembershipResponse(
+    return [
+        MembershipResponse(
             id=m.id,
             user_id=m.user_id,
             restaurant_id=m.restaurant_id,
             role=m.role,
-            user_email=user.email if user else None,
-            user_name=f"{user.first_name} {user.last_name}" if user else None
-        ))
-    
-    return result
+            user_email=email,
+            user_name=f"{first_name} {last_name}"
+        )
+        for m, email, first_name, last_name in rows
+    ]
 
 
 @router.post("/{restaurant_id}/memberships", response_model=MembershipResponse, status_code=status.HTTP_201_CREATED)
-async def add_member(
+def add_member(
     restaurant_id: int,
     request: AddMemberRequest,
     session: Session = Depends(get_session),
@@ -293,43 +339,40 @@ async def add_member(
     Add a member to a restaurant by email.
     Only restaurant admins and system admins can add members.
     """
-    # Find user by email
-    user = session.exec(select(User).where(User.email == request.email)).first()
+    # Find user by email (only the columns the response needs)
+    user = session.exec(
+        select(User.id, User.email, User.first_name, User.last_name).where(User.email == request.email)
+    ).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found with this email")
     
-    # Check if membership already exists
-    existing = session.exec(
-        select(Membership).where(
-            Membership.user_id == user.id,
-            Membership.restaurant_id == restaurant_id
-        )
-    ).first()
-    if existing:
+    # Create the membership with INSERT ... ON CONFLICT DO NOTHING on the
+    # (user_id, restaurant_id) unique constraint. An existing membership
+    # inserts nothing and returns no row, so there's no separate existence
+    # check - and no window where two concurrent requests both pass it.
+    insert = sqlite_insert if session.get_bind().dialect.name == "sqlite" else postgresql_insert
+    membership_id = session.exec(
+        insert(Membership)
+        .values(user_id=user.id, restaurant_id=restaurant_id, role=request.role)
+        .on_conflict_do_nothing(index_elements=["user_id", "restaurant_id"])
+        .returning(Membership.id)
+    ).scalar_one_or_none()
+    if membership_id is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is already a member of this restaurant")
-    
-    # Create membership
-    membership = Membership(
-        user_id=user.id,
-        restaurant_id=restaurant_id,
-        role=request.role
-    )
-    session.add(membership)
     session.commit()
-    session.refresh(membership)
     
     return MembershipResponse(
-        id=membership.id,
-        user_id=membership.user_id,
-        restaurant_id=membership.restaurant_id,
-        role=membership.role,
+        id=membership_id,
+        user_id=user.id,
+        restaurant_id=restaurant_id,
+        role=request.role,
         user_email=user.email,
         user_name=f"{user.first_name} {user.last_name}"
     )
 
 
 @router.put("/{restaurant_id}/memberships/{membership_id}", response_model=MembershipResponse)
-async def update_membership(
+def update_membership(
     restaurant_id: int,
     membership_id: int,
     request: UpdateMembershipRequest,
@@ -340,34 +383,36 @@ async def update_membership(
     Update a member's role.
     Only restaurant admins and system admins can update roles.
     """
-    membership = session.exec(
-        select(Membership).where(
+    # Load the membership together with its user so the response needs no
+    # second query; nothing else changes on commit, so no refresh either
+    row = session.exec(
+        select(Membership, User.email, User.first_name, User.last_name)
+        .join(User, User.id == Membership.user_id)
+        .where(
             Membership.id == membership_id,
             Membership.restaurant_id == restaurant_id
         )
     ).first()
-    if not membership:
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Membership not found")
+    membership, email, first_name, last_name = row
     
     membership.role = request.role
     session.add(membership)
     session.commit()
-    session.refresh(membership)
-    
-    user = session.exec(select(User).where(User.id == membership.user_id)).first()
     
     return MembershipResponse(
         id=membership.id,
         user_id=membership.user_id,
         restaurant_id=membership.restaurant_id,
         role=membership.role,
-        user_email=user.email if user else None,
-        user_name=f"{user.first_name} {user.last_name}" if user else None
+        user_email=email,
+        user_name=f"{first_name} {last_name}"
     )
 
 
 @router.delete("/{restaurant_id}/memberships/{membership_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_member(
+def remove_member(
     restaurant_id: int,
     membership_id: int,
     session: Session = Depends(get_session),
@@ -417,7 +462,7 @@ class InvitationInfoResponse(BaseModel):
 
 
 @router.post("/{restaurant_id}/invite", response_model=InvitationResponse)
-async def invite_staff(
+def invite_staff(
     restaurant_id: int,
     request: InviteStaffRequest,
     session: Session = Depends(get_session),
@@ -468,11 +513,11 @@ async def invite_staff(
     # In development, log the invitation link if email fails
     if not email_sent:
         invite_link = f"{settings.FRONTEND_URL}/accept-invitation?token={invitation_token}"
-        print(f"\n{'='*60}")
-        print(f"EMAIL FAILED - Use this link to accept invitation:")
-        print(f"Email: {request.email}")
-        print(f"Link: {invite_link}")
-        print(f"{'='*60}\n")
+        logger.warning(
+            "Invitation email to %s failed - use this link to accept the invitation: %s",
+            request.email,
+            invite_link,
+        )
     
     return InvitationResponse(
         message=f"Invitation sent to {request.email}" if email_sent else f"Invitation created for {request.email} (check server logs for link)",
@@ -481,7 +526,7 @@ async def invite_staff(
 
 
 @router.get("/invitation/verify", response_model=InvitationInfoResponse)
-async def verify_invitation(
+def verify_invitation(
     token: str,
     session: Session = Depends(get_session)
 ):
@@ -517,7 +562,7 @@ async def verify_invitation(
 
 
 @router.post("/invitation/accept", response_model=MembershipResponse)
-async def accept_invitation(
+def accept_invitation(
     request: AcceptInvitationRequest,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
@@ -60,7 +60,7 @@ def validate_image(file: UploadFile) -> None:
 
 
 @router.post("/recipe-image", response_model=UploadResponse)
-async def upload_recipe_image(
+def upload_recipe_image(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
@@ -89,8 +89,9 @@ async def upload_recipe_image(
     # Validate the file
     validate_image(file)
     
-    # Read file content
-    content = await file.read()
+    # Read file content (this handler is a plain `def` running in the
+    # threadpool, so read the underlying file directly rather than awaiting)
+    content = file.file.read()
     
     # Double-check size after reading (in case size was None before)
     if len(content) > MAX_IMAGE_SIZE:
@@ -119,7 +120,7 @@ async def upload_recipe_image(
 
 
 @router.delete("/recipe-image")
-async def delete_recipe_image(
+def delete_recipe_image(
     file_url: str,
     current_user: User = Depends(get_current_user)
 ):
@@ -183,7 +184,7 @@ async def delete_recipe_image(
 # ==================== Restaurant Logo Uploads ====================
 
 @router.post("/restaurant-logo", response_model=UploadResponse)
-async def upload_restaurant_logo(
+def upload_restaurant_logo(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
@@ -212,8 +213,9 @@ async def upload_restaurant_logo(
     # Validate the file
     validate_image(file)
     
-    # Read file content
-    content = await file.read()
+    # Read file content (this handler is a plain `def` running in the
+    # threadpool, so read the underlying file directly rather than awaiting)
+    content = file.file.read()
     
     # Double-check size after reading
     if len(content) > MAX_IMAGE_SIZE:
@@ -243,7 +245,7 @@ async def upload_restaurant_logo(
 
 
 @router.delete("/restaurant-logo")
-async def delete_restaurant_logo(
+def delete_restaurant_logo(
     file_url: str,
     current_user: User = Depends(get_current_user)
 ):
@@ -10,11 +10,23 @@ Key features:
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
 from typing import Dict, Set
-import json
+
+from ..models.order import OrderRead
 
 router = APIRouter(prefix="/ws", tags=["WebSocket"])
 
 
+def _order_message(message_type: str, order: OrderRead) -> str:
+    """
+    Build the JSON text frame {"type": ..., "data": <order>}.
+    
+    The order is serialized straight to JSON by pydantic-core and spliced in,
+    instead of dumping it to a dict and then json.dumps-ing that dict.
+    (message_type is one of our own constants, so it needs no escaping.)
+    """
+    return f'{{"type":"{message_type}","data":{order.model_dump_json()}}}'
+
+
 # =============================================================================
 # Connection Manager
 # =============================================================================
@@ -56,13 +68,10 @@ class ConnectionManager:
             if not self.customer_connections[user_id]:
                 del self.customer_connections[user_id]
     
-    async def notify_restaurant_new_order(self, restaurant_id: int, order_data: dict):
-        """Notify restaurant of a new order."""
+    async def notify_restaurant_new_order(self, restaurant_id: int, order: OrderRead):
+        """Notify restaurant of a new order (serialized only if anyone is listening)."""
         if restaurant_id in self.restaurant_connections:
-            message = json.dumps({
-                "type": "new_order",
-                "data": order_data
-            })
+            message = _order_message("new_order", order)
             dead_connections = set()
             for websocket in self.restaurant_connections[restaurant_id]:
                 try:
@@ -73,13 +82,10 @@ class ConnectionManager:
             for ws in dead_connections:
                 self.restaurant_connections[restaurant_id].discard(ws)
     
-    async def notify_customer_order_update(self, user_id: int, order_data: dict):
-        """Notify customer of an order status change."""
+    async def notify_customer_order_update(self, user_id: int, order: OrderRead):
+        """Notify customer of an order status change (serialized only if anyone is listening)."""
         if user_id in self.customer_connections:
-            message = json.dumps({
-                "type": "order_update",
-                "data": order_data
-            })
+            message = _order_message("order_update", order)
             dead_connections = set()
             for websocket in self.customer_connections[user_id]:
                 try:
@@ -148,11 +154,11 @@ async def customer_websocket(
 # Helper function for routes to send notifications
 # =============================================================================
 
-async def notify_new_order(restaurant_id: int, order_data: dict):
+async def notify_new_order(restaurant_id: int, order: OrderRead):
     """Called from order_routes when a new order is created."""
-    await manager.notify_restaurant_new_order(restaurant_id, order_data)
+    await manager.notify_restaurant_new_order(restaurant_id, order)
 
 
-async def notify_order_status_change(customer_id: int, order_data: dict):
+async def notify_order_status_change(customer_id: int, order: OrderRead):
     """Called from order_routes when order status changes."""
-    await manager.notify_customer_order_update(customer_id, order_data)
+    await manager.notify_customer_order_update(customer_id, order)
@@ -5,10 +5,16 @@ This module handles user authentication - determining WHO the user is.
 It extracts and validates JWT tokens from cookies or headers.
 """
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
 from fastapi import Depends, HTTPException, status, Request
 from sqlmodel import Session, select
 from typing import Optional
 
+from ..config import settings
 from ..db.session import get_session
 from ..models.user import User
 from .auth_utils import decode_access_token
@@ -17,6 +23,75 @@ from fastapi.security import OAuth2PasswordBearer
 # Cookie name for httpOnly auth cookie
 COOKIE_NAME = "access_token"
 
+# =============================================================================
+# Auth Caches
+# =============================================================================
+# Every authenticated request needs (1) the verified JWT and (2) the user's
+# row. Both are cached per process for a few seconds:
+#
+# - Token cache: SHA-256 of the raw token -> (username, user id). A hit skips JWT
+#   signature/claims verification. Entries never outlive the token's own
+#   "exp", and failed verifications are never cached.
+# - User cache: username -> the user's column values. A hit skips the SELECT.
+#   Every request gets its own User built from those values, so a handler
+#   that modifies current_user can't leak the change into other requests.
+#   Endpoints that change a user's row call invalidate_cached_user().
+#
+# Both are LRU-bounded OrderedDicts. get_current_user and the route handlers
+# that invalidate entries are sync and run concurrently in the threadpool, so
+# every access goes through _cache_lock (uncontended, it costs well under a
+# microsecond).
+_USER_CACHE_TTL = settings.USER_CACHE_TTL_SECONDS
+_USER_CACHE_MAX_SIZE = settings.USER_CACHE_MAX_SIZE
+# current_user is built from just these columns (never the password hash).
+# It's a detached User with no session: routes can read these fields but
+# must not lazy-load relationships from it.
+_CURRENT_USER_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.role,
+    User.email_verified,
+)
+_token_cache: OrderedDict[bytes, tuple[float, tuple[str, int | None]]] = OrderedDict()
+_user_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def invalidate_cached_user(username: str | None = None) -> None:
+    """Drop one user's cached row, or both caches entirely when no username is given."""
+    with _cache_lock:
+        if username is None:
+            _token_cache.clear()
+            _user_cache.clear()
+        else:
+            _user_cache.pop(username, None)
+
+
+def _cache_get(cache: OrderedDict, key):
+    """Return a live cached value (marking it recently used), or None."""
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_put(cache: OrderedDict, key, value, ttl: float) -> None:
+    """Store a value for ttl seconds, evicting the least recently used entry if full."""
+    with _cache_lock:
+        cache[key] = (time.monotonic() + ttl, value)
+        cache.move_to_end(key)
+        if len(cache) > _USER_CACHE_MAX_SIZE:
+            cache.popitem(last=False)
+
+
 # Initialize OAuth2PasswordBearer (still used for Swagger docs, but optional in actual auth)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=False)
 
@@ -46,30 +121,61 @@ def get_token_from_cookie_or_header(
     )
 
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(get_token_from_cookie_or_header),
     session: Session = Depends(get_session)
 ) -> User:
     """
     Dependency function to get the current authenticated user from a JWT token.
     Accepts token from httpOnly cookie or Authorization header.
+    
+    A plain `def`, like the route handlers: on a cache miss the user SELECT
+    blocks, so FastAPI runs this in its threadpool instead of on the event loop.
     """
-    payload = decode_access_token(token)  # Decodes and validates the token
-    username: str = payload.get("sub")  # Get the 'sub' (subject) claim, which is our username
+    token_key = hashlib.sha256(token.encode()).digest()
+    subject = _cache_get(_token_cache, token_key) if _USER_CACHE_TTL > 0 else None
 
-    if username is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if subject is None:
+        payload = decode_access_token(token)  # Decodes and validates the token
+        username = payload.get("sub")  # Get the 'sub' (subject) claim, which is our username
+        user_id = payload.get("uid")  # User's primary key (missing in tokens issued before it was added)
+
+        if username is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        subject = (username, user_id)
+        if _USER_CACHE_TTL > 0:
+            # Don't trust the token past its own expiry
+            ttl = min(_USER_CACHE_TTL, payload["exp"] - time.time())
+            if ttl > 0:
+                _cache_put(_token_cache, token_key, subject, ttl)
+
+    username, user_id = subject
+
+    # Reuse a recent snapshot if we have one. The cache is keyed by username,
+    # so it must also be the token's user: if that account was deleted and the
+    # username re-registered, the old token must not resolve to the new user.
+    cached_user = _cache_get(_user_cache, username)
+    if cached_user is not None and (user_id is None or cached_user["id"] == user_id):
+        return User(**cached_user)
 
-    # Fetch the user from the database
-    user = session.exec(select(User).where(User.username == username)).first()
-    if user is None:
+    # Fetch the user from the database - by primary key when the token has it
+    # (username is still checked, so a token can only ever match its own user)
+    query = select(*_CURRENT_USER_COLUMNS).where(User.username == username)
+    if user_id is not None:
+        query = query.where(User.id == user_id)
+    row = session.exec(query).first()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found in database",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    user_fields = dict(row._mapping)
+    if _USER_CACHE_TTL > 0:
+        _cache_put(_user_cache, username, user_fields, _USER_CACHE_TTL)
+    return User(**user_fields)
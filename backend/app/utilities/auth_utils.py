@@ -1,22 +1,55 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
-from jose import jwt
+from jose import jwk, jwt
 from fastapi import HTTPException, status
 
 # Import centralized settings
 from ..config import settings
 
+# JWT settings are read on every request, so bind them once at import
+SECRET_KEY = settings.SECRET_KEY
+ALGORITHM = settings.ALGORITHM
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+ACCESS_TOKEN_EXPIRE = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+
+# python-jose turns a plain secret into a Key object on every encode/decode
+# (after first trying to parse it as a JSON JWK). Building the Key once here
+# and passing it in skips that work on every authenticated request.
+_JWT_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+
 # ---Password Hashing---
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated=["auto"])
+# New hashes use Argon2id with OWASP's recommended minimum parameters
+# (46 MiB memory, 1 iteration, 1 lane). bcrypt stays in the list so
+# existing hashes still verify; it's marked deprecated, so logins upgrade
+# them to Argon2id (see verify_and_update_password).
+#
+# Hashing is deliberately slow and CPU-bound, so async routes must call
+# these through run_in_threadpool to keep the event loop free.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=46 * 1024,  # KiB
+    argon2__time_cost=1,
+    argon2__parallelism=1,
+    argon2__digest_size=32,
+)
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
+    """Hash a password using Argon2id."""
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify a password and, if its hash uses outdated settings (e.g. bcrypt),
+    return a fresh hash to store. Returns (is_valid, new_hash_or_None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 # ---Token Generation---
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
@@ -24,15 +57,15 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     if expires_delta:
         expire  = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + ACCESS_TOKEN_EXPIRE
     
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
 
 def decode_access_token(token: str) -> dict:
     """Verify a JWT token and return the payload."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _JWT_KEY, algorithms=[ALGORITHM])
         return payload
     except jwt.JWTError:
          # This catches various JWT errors like invalid signature, expired token, etc.
@@ -61,7 +94,7 @@ def create_password_reset_token(email: str) -> str:
         "exp": expire
     }
     
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
 
 
 def verify_password_reset_token(token: str) -> str | None:
@@ -74,8 +107,8 @@ def verify_password_reset_token(token: str) -> str | None:
     try:
         payload = jwt.decode(
             token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
+            _JWT_KEY, 
+            algorithms=[ALGORITHM]
         )
         
         # Verify this is actually a password reset token
@@ -106,7 +139,7 @@ def create_email_verification_token(email: str) -> str:
         "exp": expire
     }
     
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
 
 
 def verify_email_verification_token(token: str) -> str | None:
@@ -119,8 +152,8 @@ def verify_email_verification_token(token: str) -> str | None:
     try:
         payload = jwt.decode(
             token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
+            _JWT_KEY, 
+            algorithms=[ALGORITHM]
         )
         
         # Verify this is actually an email verification token
@@ -154,7 +187,7 @@ def create_staff_invitation_token(email: str, restaurant_id: int, role: str) ->
         "exp": expire
     }
     
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
 
 
 def verify_staff_invitation_token(token: str) -> dict | None:
@@ -167,8 +200,8 @@ def verify_staff_invitation_token(token: str) -> dict | None:
     try:
         payload = jwt.decode(
             token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
+            _JWT_KEY, 
+            algorithms=[ALGORITHM]
         )
         
         # Verify this is actually a staff invitation token
@@ -5,17 +5,19 @@ Handles all email sending functionality using Resend.
 This module provides a clean interface for sending various types of emails.
 """
 
-import os
+import logging
+
 import resend
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Import centralized settings (the .env file is loaded once, in app.config)
+from ..config import settings
+
+logger = logging.getLogger(__name__)
 
 # Configure Resend
-resend.api_key = os.getenv("RESEND_API_KEY")
-FROM_EMAIL = os.getenv("FROM_EMAIL", "onboarding@resend.dev")
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
+resend.api_key = settings.RESEND_API_KEY
+FROM_EMAIL = settings.FROM_EMAIL
+FRONTEND_URL = settings.FRONTEND_URL
 
 
 def send_email(to: str, subject: str, html: str) -> bool:
@@ -31,11 +33,11 @@ def send_email(to: str, subject: str, html: str) -> bool:
         True if sent successfully, False otherwise
     """
     if not to:
-        print("ERROR: No recipient email provided")
+        logger.error("No recipient email provided")
         return False
     
     if not resend.api_key:
-        print("ERROR: RESEND_API_KEY is not set")
+        logger.error("RESEND_API_KEY is not set")
         return False
         
     try:
@@ -46,13 +48,13 @@ def send_email(to: str, subject: str, html: str) -> bool:
             "html": html,
         }
         
-        print(f"Sending email to: {to}, subject: {subject}")
+        logger.debug("Sending email to %s, subject: %s", to, subject)
         response = resend.Emails.send(params)
-        print(f"Email sent successfully: {response}")
+        logger.info("Email sent to %s: %s", to, response)
         return True
         
     except Exception as e:
-        print(f"Failed to send email to {to}: {type(e).__name__}: {e}")
+        logger.warning("Failed to send email to %s: %s: %s", to, type(e).__name__, e)
         return False
 
 
@@ -18,12 +18,33 @@ from ..models.user import SystemRole, User
 from .auth import get_current_user
 
 
+def _get_org_role(session: Session, user_id: int, restaurant_id: int) -> OrgRole | None:
+    """
+    The user's role in a restaurant, or None if they aren't a member.
+    
+    Only the role column is selected: it's all an access check needs, and
+    the (user_id, restaurant_id) unique index finds the row directly.
+    Per-request reuse comes from FastAPI itself - a dependency used several
+    times in one request (e.g. by the route and by another dependency) is
+    only run once - so each protected request makes at most this one query.
+    """
+    return session.exec(
+        select(Membership.role).where(
+            Membership.user_id == user_id,
+            Membership.restaurant_id == restaurant_id
+        )
+    ).first()
+
+
 def require_system_roles(*roles: SystemRole):
     """
     Requires the user to have one of the specified system-wide roles.
     """
+    # Built once when the route is declared; each request is a set lookup
+    allowed_roles = frozenset(roles)
+
     def dependency(current_user: User = Depends(get_current_user)):
-        if current_user.role not in roles:
+        if current_user.role not in allowed_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         return current_user
     return dependency
@@ -31,7 +52,8 @@ def require_system_roles(*roles: SystemRole):
 
 async def require_superadmin(current_user: User = Depends(get_current_user)):
     """Ensure the current user is a superadmin."""
-    if current_user.role != SystemRole.SUPERADMIN:
+    # Enum members are singletons, so an identity check is enough
+    if current_user.role is not SystemRole.SUPERADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="This action requires superadmin privileges"
@@ -43,18 +65,14 @@ def require_org_roles(*roles: OrgRole):
     """
     Requires the user to have one of the specified roles within a restaurant.
     """
+    allowed_roles = frozenset(roles)
+
     def dependency(
         restaurant_id: int,
         current_user: User = Depends(get_current_user),
         session: Session = Depends(get_session)
     ):
-        membership = session.exec(
-            select(Membership).where(
-                Membership.user_id == current_user.id,
-                Membership.restaurant_id == restaurant_id
-            )
-        ).first()
-        if not membership or membership.role not in roles:
+        if _get_org_role(session, current_user.id, restaurant_id) not in allowed_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
         return current_user
     return dependency
@@ -64,8 +82,8 @@ def require_org_or_system_roles(*, system_roles: list[SystemRole] = None, org_ro
     """
     Allows access if user has a matching system role OR a matching org role for a given restaurant.
     """
-    system_roles = system_roles or []
-    org_roles = org_roles or []
+    system_roles = frozenset(system_roles or ())
+    org_roles = frozenset(org_roles or ())
 
     def dependency(
         restaurant_id: int,
@@ -77,14 +95,7 @@ def require_org_or_system_roles(*, system_roles: list[SystemRole] = None, org_ro
             return current_user
 
         # Check org membership (restaurant-level)
-        membership = session.exec(
-            select(Membership).where(
-                Membership.user_id == current_user.id,
-                Membership.restaurant_id == restaurant_id,
-            )
-        ).first()
-
-        if not membership or membership.role not in org_roles:
+        if _get_org_role(session, current_user.id, restaurant_id) not in org_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to perform this action.",
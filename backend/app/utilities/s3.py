@@ -5,6 +5,8 @@ This module handles all interactions with AWS S3 (or LocalStack in development).
 It provides functions to upload, delete, and generate URLs for files.
 """
 
+import logging
+
 import boto3
 import uuid
 from botocore.exceptions import ClientError
@@ -19,6 +21,8 @@ AWS_ACCESS_KEY_ID = settings.AWS_ACCESS_KEY_ID
 AWS_SECRET_ACCESS_KEY = settings.AWS_SECRET_ACCESS_KEY
 AWS_REGION = settings.AWS_REGION
 
+logger = logging.getLogger(__name__)
+
 
 def get_s3_client():
     """
@@ -46,13 +50,13 @@ def ensure_bucket_exists():
     
     try:
         s3.head_bucket(Bucket=S3_BUCKET_NAME)
-        print(f"Bucket '{S3_BUCKET_NAME}' already exists")
+        logger.info("Bucket '%s' already exists", S3_BUCKET_NAME)
     except ClientError as e:
         error_code = e.response.get('Error', {}).get('Code')
         if error_code == '404' or error_code == 'NoSuchBucket':
             # Bucket doesn't exist, create it
             s3.create_bucket(Bucket=S3_BUCKET_NAME)
-            print(f"Created bucket '{S3_BUCKET_NAME}'")
+            logger.info("Created bucket '%s'", S3_BUCKET_NAME)
         else:
             raise e
 
@@ -137,7 +141,7 @@ def delete_file(file_url: str) -> bool:
         s3.delete_object(Bucket=S3_BUCKET_NAME, Key=filename)
         return True
     except ClientError as e:
-        print(f"Error deleting file: {e}")
+        logger.warning("Error deleting file %s: %s", file_url, e)
         return False
 
 
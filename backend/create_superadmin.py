@@ -72,7 +72,7 @@ def create_superadmin():
         
         # Create new superadmin
         superadmin = User(
-            username=admin_username,
+            username=admin_username.strip().lower(),  # Stored lowercase, like registration
             email=admin_email,
             first_name="System",
             last_name="Administrator",
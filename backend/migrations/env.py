@@ -9,7 +9,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import all models so Alembic sees them
-from app.db.base import SQLModel  # Ensures all models are imported via base.py
+from app.db.base import SQLModel, ensure_models_loaded
+
+ensure_models_loaded()
 
 # Alembic Config object
 config = context.config
@@ -0,0 +1,28 @@
+"""add lower(username) index for case-insensitive login
+
+Revision ID: 0d95b6008881
+Revises: a10cb400e4c3
+Create Date: 2026-10-15 12:17:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d95b6008881'
+down_revision: Union[str, Sequence[str], None] = 'a10cb400e4c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_user_username_lower", "user", [sa.text("lower(username)")], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_user_username_lower", table_name="user")
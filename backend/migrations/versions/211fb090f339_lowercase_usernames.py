@@ -0,0 +1,50 @@
+"""lowercase usernames and make the lower(username) index unique
+
+Revision ID: 211fb090f339
+Revises: 465eac8b39eb
+Create Date: 2026-10-15 12:22:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '211fb090f339'
+down_revision: Union[str, Sequence[str], None] = '465eac8b39eb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lowercase every mixed-case username so login can match on plain
+    # equality. If the lowercase name is already taken - by a row that is
+    # already lowercase, or by an older mixed-case row ("Alice" and "ALICE")
+    # - this row gets its id appended ("alice_42") rather than failing the
+    # unique index. Renamed users log in with the new name.
+    op.execute(
+        """
+        UPDATE "user" AS u
+        SET username = lower(u.username) || CASE WHEN EXISTS (
+            SELECT 1 FROM "user" AS other
+            WHERE other.id <> u.id
+              AND lower(other.username) = lower(u.username)
+              AND (other.username = lower(other.username) OR other.id < u.id)
+        ) THEN '_' || u.id ELSE '' END
+        WHERE u.username <> lower(u.username)
+        """
+    )
+    # Now that no two usernames differ only by case, lower(username) can be unique
+    op.drop_index("ix_user_username_lower", table_name="user")
+    op.create_index("ix_user_username_lower", "user", [sa.text("lower(username)")], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The original casing of renamed usernames isn't kept, so only the index
+    # goes back to non-unique
+    op.drop_index("ix_user_username_lower", table_name="user")
+    op.create_index("ix_user_username_lower", "user", [sa.text("lower(username)")], unique=False)
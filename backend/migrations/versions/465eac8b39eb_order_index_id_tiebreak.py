@@ -0,0 +1,56 @@
+"""add id to the order pagination indexes
+
+Revision ID: 465eac8b39eb
+Revises: 834c3b14a90c
+Create Date: 2026-10-15 12:21:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+_ACTIVE_STATUS_SQL = "status IN ('PENDING', 'PAID', 'PREPARING', 'READY')"
+
+
+# revision identifiers, used by Alembic.
+revision: str = '465eac8b39eb'
+down_revision: Union[str, Sequence[str], None] = '834c3b14a90c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Order lists page by (created_at, id), so add id as the last index
+    # column: the id tiebreak in ORDER BY is then read off the index too
+    op.drop_index('ix_order_customer_created', table_name='order')
+    op.create_index('ix_order_customer_created', 'order', ['customer_id', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_order_restaurant_created', table_name='order')
+    op.create_index('ix_order_restaurant_created', 'order', ['restaurant_id', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_order_restaurant_status_created', table_name='order')
+    op.create_index(
+        'ix_order_restaurant_status_created', 'order', ['restaurant_id', 'status', 'created_at', 'id'], unique=False
+    )
+    op.drop_index('ix_order_restaurant_active', table_name='order', postgresql_where=sa.text(_ACTIVE_STATUS_SQL))
+    op.create_index(
+        'ix_order_restaurant_active', 'order', ['restaurant_id', 'created_at', 'id'], unique=False,
+        postgresql_where=sa.text(_ACTIVE_STATUS_SQL),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_restaurant_active', table_name='order', postgresql_where=sa.text(_ACTIVE_STATUS_SQL))
+    op.create_index(
+        'ix_order_restaurant_active', 'order', ['restaurant_id', 'created_at'], unique=False,
+        postgresql_where=sa.text(_ACTIVE_STATUS_SQL),
+    )
+    op.drop_index('ix_order_restaurant_status_created', table_name='order')
+    op.create_index(
+        'ix_order_restaurant_status_created', 'order', ['restaurant_id', 'status', 'created_at'], unique=False
+    )
+    op.drop_index('ix_order_restaurant_created', table_name='order')
+    op.create_index('ix_order_restaurant_created', 'order', ['restaurant_id', 'created_at'], unique=False)
+    op.drop_index('ix_order_customer_created', table_name='order')
+    op.create_index('ix_order_customer_created', 'order', ['customer_id', 'created_at'], unique=False)
@@ -0,0 +1,38 @@
+"""add order lookup indexes
+
+Revision ID: 5c23603d444e
+Revises: 8217b6a385ba
+Create Date: 2026-10-15 12:13:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c23603d444e'
+down_revision: Union[str, Sequence[str], None] = '8217b6a385ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_order_customer_status', 'order', ['customer_id', 'status'], unique=False)
+    op.create_index('ix_order_restaurant_created', 'order', ['restaurant_id', 'created_at'], unique=False)
+    # Partial index: only orders that are still being worked on
+    op.create_index(
+        'ix_order_restaurant_active', 'order', ['restaurant_id', 'created_at'], unique=False,
+        postgresql_where=sa.text("status IN ('PENDING', 'PAID', 'PREPARING', 'READY')"),
+    )
+    op.create_index(op.f('ix_orderitem_order_id'), 'orderitem', ['order_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_orderitem_order_id'), table_name='orderitem')
+    op.drop_index('ix_order_restaurant_active', table_name='order', postgresql_where=sa.text("status IN ('PENDING', 'PAID', 'PREPARING', 'READY')"))
+    op.drop_index('ix_order_restaurant_created', table_name='order')
+    op.drop_index('ix_order_customer_status', table_name='order')
@@ -0,0 +1,49 @@
+"""database-side created_at and updated_at defaults
+
+Revision ID: 5eb938f137c5
+Revises: 5c23603d444e
+Create Date: 2026-10-15 12:14:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5eb938f137c5'
+down_revision: Union[str, Sequence[str], None] = '5c23603d444e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing values were written as naive UTC, so read them back as UTC
+    # while converting to timestamptz, then let the database stamp new rows.
+    for table in ('user', 'restaurant', 'recipe', 'order'):
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(
+                table, column,
+                existing_type=postgresql.TIMESTAMP(),
+                type_=sa.DateTime(timezone=True),
+                existing_nullable=False,
+                server_default=sa.text('now()'),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('user', 'restaurant', 'recipe', 'order'):
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(
+                table, column,
+                existing_type=sa.DateTime(timezone=True),
+                type_=postgresql.TIMESTAMP(),
+                existing_nullable=False,
+                server_default=None,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
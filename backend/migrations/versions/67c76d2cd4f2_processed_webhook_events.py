@@ -0,0 +1,33 @@
+"""add processedwebhookevent table
+
+Revision ID: 67c76d2cd4f2
+Revises: c3d2e4000a52
+Create Date: 2026-10-15 12:19:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '67c76d2cd4f2'
+down_revision: Union[str, Sequence[str], None] = 'c3d2e4000a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('processedwebhookevent',
+    sa.Column('event_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('processedwebhookevent')
@@ -0,0 +1,34 @@
+"""store recipe ingredients and instructions as jsonb
+
+Revision ID: 8217b6a385ba
+Revises: 80c7f18f3994
+Create Date: 2026-10-15 12:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8217b6a385ba'
+down_revision: Union[str, Sequence[str], None] = '80c7f18f3994'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Convert the JSON columns to JSONB in place (existing data is kept)
+    op.alter_column('recipe', 'ingredients', type_=postgresql.JSONB(), postgresql_using='ingredients::jsonb')
+    op.alter_column('recipe', 'instructions', type_=postgresql.JSONB(), postgresql_using='instructions::jsonb')
+    op.create_index('ix_recipe_ingredients_gin', 'recipe', ['ingredients'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_recipe_ingredients_gin', table_name='recipe', postgresql_using='gin')
+    op.alter_column('recipe', 'instructions', type_=sa.JSON(), postgresql_using='instructions::json')
+    op.alter_column('recipe', 'ingredients', type_=sa.JSON(), postgresql_using='ingredients::json')
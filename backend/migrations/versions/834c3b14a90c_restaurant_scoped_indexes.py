@@ -0,0 +1,31 @@
+"""index recipes and memberships by restaurant
+
+Revision ID: 834c3b14a90c
+Revises: 67c76d2cd4f2
+Create Date: 2026-10-15 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '834c3b14a90c'
+down_revision: Union[str, Sequence[str], None] = '67c76d2cd4f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Recipe and staff lists are scoped to one restaurant and paged by id
+    op.create_index('ix_recipe_restaurant_id_id', 'recipe', ['restaurant_id', 'id'], unique=False)
+    op.create_index('ix_membership_restaurant_id_id', 'membership', ['restaurant_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_membership_restaurant_id_id', table_name='membership')
+    op.drop_index('ix_recipe_restaurant_id_id', table_name='recipe')
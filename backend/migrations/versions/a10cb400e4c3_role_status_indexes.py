@@ -0,0 +1,30 @@
+"""index user role and restaurant approval status
+
+Revision ID: a10cb400e4c3
+Revises: dd5ebca88061
+Create Date: 2026-10-15 12:16:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a10cb400e4c3'
+down_revision: Union[str, Sequence[str], None] = 'dd5ebca88061'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_user_role', 'user', ['role'], unique=False)
+    op.create_index(op.f('ix_restaurant_approval_status'), 'restaurant', ['approval_status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_restaurant_approval_status'), table_name='restaurant')
+    op.drop_index('ix_user_role', table_name='user')
@@ -0,0 +1,36 @@
+"""index order lists by created_at
+
+Revision ID: c3d2e4000a52
+Revises: 0d95b6008881
+Create Date: 2026-10-15 12:18:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d2e4000a52'
+down_revision: Union[str, Sequence[str], None] = '0d95b6008881'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nothing filters a customer's orders by status; the history is listed
+    # newest first, so index (customer_id, created_at) instead
+    op.drop_index('ix_order_customer_status', table_name='order')
+    op.create_index('ix_order_customer_created', 'order', ['customer_id', 'created_at'], unique=False)
+    op.create_index(
+        'ix_order_restaurant_status_created', 'order', ['restaurant_id', 'status', 'created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_restaurant_status_created', table_name='order')
+    op.drop_index('ix_order_customer_created', table_name='order')
+    op.create_index('ix_order_customer_status', 'order', ['customer_id', 'status'], unique=False)
@@ -0,0 +1,33 @@
+"""use jsonb_path_ops for the recipe ingredients gin index
+
+Revision ID: dd5ebca88061
+Revises: 5eb938f137c5
+Create Date: 2026-10-15 12:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dd5ebca88061'
+down_revision: Union[str, Sequence[str], None] = '5eb938f137c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_recipe_ingredients_gin', table_name='recipe', postgresql_using='gin')
+    op.create_index(
+        'ix_recipe_ingredients_gin', 'recipe', ['ingredients'], unique=False,
+        postgresql_using='gin', postgresql_ops={'ingredients': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_recipe_ingredients_gin', table_name='recipe', postgresql_using='gin')
+    op.create_index('ix_recipe_ingredients_gin', 'recipe', ['ingredients'], unique=False, postgresql_using='gin')
@@ -27,6 +27,7 @@ WHY USE FIXTURES?
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
@@ -39,6 +40,8 @@ from app.models.membership import Membership, OrgRole
 from app.models.recipe import Recipe
 from app.models.order import Order, OrderItem
 from app.models.enums import OrderStatus
+from app.routes import auth_routes
+from app.utilities.auth import invalidate_cached_user
 from app.utilities.auth_utils import hash_password
 
 
@@ -76,11 +79,16 @@ def session_fixture():
         poolclass=StaticPool,  # Keep same connection for all operations
     )
     
+    # SQLite only enforces foreign keys when asked to (PostgreSQL always
+    # does), so turn them on to catch the same constraint errors as production
+    event.listen(engine, "connect", lambda dbapi_connection, _: dbapi_connection.execute("PRAGMA foreign_keys=ON"))
+    
     # Create all tables (User, Restaurant, Order, etc.)
     SQLModel.metadata.create_all(engine)
     
     # Create a session and yield it to the test
-    with Session(engine) as session:
+    # (same options as the app's SessionLocal factory in app/db/database.py)
+    with Session(engine, expire_on_commit=False, autoflush=False) as session:
         yield session
     
     # After the test, the session closes and database disappears
@@ -117,6 +125,12 @@ def client_fixture(session: Session):
     
     app.dependency_overrides[get_session] = get_session_override
     
+    # Every test builds a fresh database, so users cached by an earlier test
+    # (same username, different row) must not leak into this one.
+    # Likewise forget which addresses were recently sent reset/verify emails.
+    invalidate_cached_user()
+    auth_routes._recent_email_requests.clear()
+    
     # Create the test client
     client = TestClient(app)
     yield client
@@ -254,22 +268,23 @@ def test_recipe_fixture(session: Session, test_restaurant: Restaurant):
 # Authentication Helper Fixture
 # =============================================================================
 
-@pytest.fixture(name="auth_headers")
-def auth_headers_fixture():
+@pytest.fixture(name="login")
+def login_fixture(client: TestClient):
     """
-    Returns a function to create auth headers for a given user.
+    Returns a function that logs a user in via /auth/token.
     
     Usage in tests:
-        headers = auth_headers(test_customer, client)
-        response = client.get("/some/protected/endpoint", headers=headers)
+        login(test_customer)
+        response = client.get("/some/protected/endpoint")
+    
+    Our app uses httpOnly cookies, so there are no headers to pass around:
+    the test client stores the auth cookie and sends it on later requests.
+    Pass client=... to log in on a different TestClient.
     """
-    def _get_auth_headers(user: User, client: TestClient, password: str = None):
-        """
-        Log in as the user and return headers with the auth cookie.
-        
-        Note: Our app uses httpOnly cookies, so we need to let the
-        test client handle cookies automatically.
-        """
+    default_client = client
+    
+    def _login(user: User, password: str | None = None, client: TestClient | None = None):
+        """Log in as the user, assert it worked, and return the response."""
         # Determine password based on user role (matches our fixtures)
         if password is None:
             if user.role == SystemRole.CUSTOMER:
@@ -281,14 +296,11 @@ def auth_headers_fixture():
             else:
                 password = "TestPassword123!"
         
-        # Log in to get the cookie
-        response = client.post(
-            "/auth/login",
+        response = (client or default_client).post(
+            "/auth/token",
             json={"username": user.username, "password": password}
         )
-        
-        # The cookie is automatically stored in the client
-        # Just return empty dict - client handles cookies
-        return {}
+        assert response.status_code == 200, f"Login failed: {response.json()}"
+        return response
     
-    return _get_auth_headers
+    return _login
@@ -0,0 +1,218 @@
+"""
+Admin Tests
+
+These tests verify the superadmin-only endpoints:
+- Listing users and restaurants
+- Approving / suspending
+- Dashboard statistics
+
+All admin endpoints require the SUPERADMIN system role, so most tests
+log in as the test_superadmin fixture first.
+"""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.recipe import Recipe
+from app.models.enums import ApprovalStatus
+from app.models.restaurant import Restaurant
+from app.models.user import SystemRole, User
+
+
+class TestAdminUsers:
+    """Tests for user management endpoints."""
+
+    def test_list_users_requires_superadmin(self, client, login, test_customer):
+        """A customer must not be able to list all users."""
+        login(test_customer)
+
+        response = client.get("/admin/users")
+
+        assert response.status_code == 403
+
+    def test_list_users(self, client, login, test_superadmin, test_customer):
+        """Superadmin sees every user, without password hashes."""
+        login(test_superadmin)
+
+        response = client.get("/admin/users")
+
+        assert response.status_code == 200
+        usernames = {user["username"] for user in response.json()}
+        assert {test_superadmin.username, test_customer.username} <= usernames
+        assert all("hashed_password" not in user for user in response.json())
+
+    def test_list_users_filtered_by_role(self, client, login, test_superadmin, test_customer, test_owner):
+        """The role query parameter filters the list."""
+        login(test_superadmin)
+
+        response = client.get("/admin/users", params={"role": "customer"})
+
+        assert response.status_code == 200
+        assert [user["username"] for user in response.json()] == [test_customer.username]
+
+    def test_list_users_paginated(self, client, login, test_superadmin, test_customer, test_owner):
+        """limit/cursor page through users in ID order."""
+        login(test_superadmin)
+
+        first_page = client.get("/admin/users", params={"limit": 2}).json()
+        second_page = client.get(
+            "/admin/users", params={"limit": 2, "cursor": first_page[-1]["id"]}
+        ).json()
+
+        ids = [user["id"] for user in first_page + second_page]
+        assert len(first_page) == 2
+        assert ids == sorted({test_superadmin.id, test_customer.id, test_owner.id})
+
+    def test_get_user_details(self, client, login, test_superadmin, test_customer):
+        """Superadmin can fetch a single user by ID."""
+        login(test_superadmin)
+
+        response = client.get(f"/admin/users/{test_customer.id}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["email"] == test_customer.email
+        assert data["role"] == "customer"
+        assert "hashed_password" not in data
+
+    def test_delete_user_with_owned_restaurants(
+        self, client, login, session, test_superadmin, test_owner, test_restaurant, test_recipe
+    ):
+        """Deleting a sole restaurant admin can also remove their restaurant (and its recipes)."""
+        login(test_superadmin)
+        restaurant_id, recipe_id = test_restaurant.id, test_recipe.id
+
+        response = client.delete(
+            f"/admin/users/{test_owner.id}",
+            params={"delete_owned_restaurants": True},
+        )
+
+        assert response.status_code == 204
+        session.expire_all()
+        assert session.get(Restaurant, restaurant_id) is None
+        assert session.get(Recipe, recipe_id) is None
+
+    def test_suspend_user(self, client, login, test_superadmin, test_customer):
+        """Suspending flips the role and returns the public user fields only."""
+        login(test_superadmin)
+
+        response = client.patch(f"/admin/users/{test_customer.id}/suspend")
+
+        assert response.status_code == 200
+        user = response.json()["user"]
+        assert user["role"] == "suspended"
+        assert "hashed_password" not in user
+
+    def test_suspend_takes_effect_for_logged_in_user(self, client, login, test_superadmin, test_customer):
+        """Suspension drops the customer's cached row, so their next request sees it."""
+        customer_client = TestClient(app)
+        login(test_customer, client=customer_client)
+        assert customer_client.get("/auth/me").json()["role"] == "customer"
+
+        login(test_superadmin)
+        client.patch(f"/admin/users/{test_customer.id}/suspend")
+
+        assert customer_client.get("/auth/me").json()["role"] == "suspended"
+
+    def test_suspend_users_bulk(self, client, login, test_superadmin, test_customer, test_owner):
+        """Bulk suspend updates every listed user except superadmins."""
+        login(test_superadmin)
+
+        response = client.patch(
+            "/admin/users/suspend-bulk",
+            json=[test_customer.id, test_owner.id, test_superadmin.id],
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"suspended": 2}
+
+    def test_cannot_suspend_self(self, client, login, test_superadmin):
+        """A superadmin targeting themselves is refused with a self-specific message."""
+        login(test_superadmin)
+
+        response = client.patch(f"/admin/users/{test_superadmin.id}/suspend")
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "Cannot suspend yourself"
+
+    def test_cannot_suspend_superadmin(self, client, login, session, test_superadmin):
+        """The UPDATE skips other superadmins, and the endpoint reports why."""
+        other_admin = User(
+            first_name="Other",
+            last_name="Admin",
+            username="admin2",
+            email="admin2@example.com",
+            hashed_password="not-used",
+            role=SystemRole.SUPERADMIN,
+        )
+        session.add(other_admin)
+        session.commit()
+        login(test_superadmin)
+
+        response = client.patch(f"/admin/users/{other_admin.id}/suspend")
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "Cannot suspend another superadmin"
+
+
+class TestAdminRestaurants:
+    """Tests for restaurant management endpoints."""
+
+    def test_list_restaurants(self, client, login, test_superadmin, test_restaurant):
+        """Superadmin can list all restaurants."""
+        login(test_superadmin)
+
+        response = client.get("/admin/restaurants")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["restaurant_name"] == test_restaurant.restaurant_name
+        assert data[0]["approval_status"] == "approved"
+
+    def test_approve_restaurant(self, client, login, session, test_superadmin):
+        """A pending restaurant can be approved exactly once."""
+        restaurant = Restaurant(
+            restaurant_name="Pending Place",
+            address="1 Waiting Lane",
+            phone="555-0199",
+            cuisine_type="Thai",
+        )
+        session.add(restaurant)
+        session.commit()
+        login(test_superadmin)
+
+        response = client.patch(f"/admin/restaurants/{restaurant.id}/approve")
+
+        assert response.status_code == 200
+        assert response.json()["restaurant"]["approval_status"] == "approved"
+        session.refresh(restaurant)
+        assert restaurant.approval_status == ApprovalStatus.APPROVED
+
+        # Second approval no longer matches the PENDING precondition
+        response = client.patch(f"/admin/restaurants/{restaurant.id}/approve")
+        assert response.status_code == 400
+
+    def test_approve_missing_restaurant(self, client, login, test_superadmin):
+        """Approving an unknown restaurant is a 404, not a 400."""
+        login(test_superadmin)
+
+        response = client.patch("/admin/restaurants/9999/approve")
+
+        assert response.status_code == 404
+
+
+class TestAdminStats:
+    """Tests for the dashboard statistics endpoint."""
+
+    def test_stats_counts(self, client, login, test_superadmin, test_customer, test_restaurant):
+        """Stats count users by role and restaurants by status."""
+        login(test_superadmin)
+
+        response = client.get("/admin/stats")
+
+        assert response.status_code == 200
+        data = response.json()
+        # test_restaurant depends on test_owner, so there is one owner too
+        assert data["users"] == {"customers": 1, "restaurant_owners": 1, "suspended": 0, "total": 2}
+        assert data["restaurants"] == {"pending": 0, "approved": 1, "suspended": 0, "total": 1}
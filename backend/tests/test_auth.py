@@ -5,6 +5,7 @@ These tests verify that our authentication system works correctly:
 - User registration
 - Login with correct/incorrect credentials
 - Protected endpoints require authentication
+- Email verification and password reset links
 
 HOW TO READ THESE TESTS
 =======================
@@ -21,6 +22,24 @@ NOTE: The login endpoint is /auth/token (not /auth/login)
 """
 
 import pytest
+from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from app.main import app
+from app.models.membership import Membership, OrgRole
+from app.models.restaurant import Restaurant
+from app.models.user import SystemRole, User
+from app.routes import auth_routes
+from app.utilities import auth
+from app.utilities.auth import get_current_user
+from app.utilities.auth_utils import (
+    create_access_token,
+    create_email_verification_token,
+    create_password_reset_token,
+    hash_password,
+)
 
 
 class TestRegistration:
@@ -45,6 +64,22 @@ class TestRegistration:
         assert "password" not in data  # Password should NOT be in response!
         assert "hashed_password" not in data  # Hash should NOT be exposed!
     
+    def test_register_restaurant_owner(self, client, session, test_user_data):
+        """
+        Test that owner registration creates the user, the restaurant and
+        the membership linking them (all in one transaction).
+        """
+        response = client.post(
+            "/auth/register/restaurant-owner",
+            json={**test_user_data, "restaurant_name": "Owner's Bistro"},
+        )
+        
+        assert response.status_code == 201, response.json()
+        owner_id = response.json()["id"]
+        membership = session.exec(select(Membership).where(Membership.user_id == owner_id)).one()
+        assert membership.role == OrgRole.RESTAURANT_ADMIN
+        assert session.get(Restaurant, membership.restaurant_id).restaurant_name == "Owner's Bistro"
+    
     def test_register_duplicate_username(self, client, test_user_data, test_customer):
         """
         Test that registering with an existing username fails.
@@ -82,6 +117,32 @@ class TestRegistration:
         
         assert response.status_code == 400
         assert "email" in response.json()["detail"].lower()
+    
+    def test_register_with_unknown_restaurant(self, client, session, test_user_data):
+        """
+        Test that an org role for a restaurant that doesn't exist is a 400.
+        
+        The membership's foreign key rejects it, the whole registration
+        rolls back, and the error isn't reported as a duplicate user.
+        """
+        response = client.post(
+            "/auth/register",
+            json={**test_user_data, "org_role": "employee", "restaurant_id": 9999}
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Restaurant not found"
+        assert session.exec(select(User).where(User.username == test_user_data["username"])).first() is None
+    
+    def test_register_weak_password(self, client, test_user_data):
+        """Test that registration reports which password rule failed."""
+        weak_data = {**test_user_data, "password": "NoDigitsHere!"}
+        
+        response = client.post("/auth/register", json=weak_data)
+        
+        # 422 = request body failed validation
+        assert response.status_code == 422
+        assert "digit" in response.text
 
 
 class TestLogin:
@@ -120,6 +181,40 @@ class TestLogin:
         assert response.status_code == 401
         assert "access_token" not in response.cookies
     
+    def test_login_username_is_case_insensitive(self, client, test_customer):
+        """Test that login normalizes the username the same way registration does."""
+        response = client.post(
+            "/auth/token",
+            json={
+                "username": f" {test_customer.username.upper()} ",
+                "password": "CustomerPass123!",
+            }
+        )
+        
+        assert response.status_code == 200, f"Login failed: {response.json()}"
+        assert response.json()["username"] == test_customer.username
+    
+    def test_mixed_case_copy_of_username_rejected(self, session, test_customer):
+        """
+        Test that no username can differ from another only by case.
+        
+        Login matches the stored (lowercase) username exactly, so the unique
+        lower(username) index stops a mixed-case row written around the
+        validators (e.g. by a script) from shadowing an existing user.
+        """
+        session.add(User(
+            first_name="Shadow",
+            last_name="Copy",
+            username=test_customer.username.upper(),
+            email="shadow@example.com",
+            hashed_password=hash_password("ShadowPass123!"),
+        ))
+        
+        with pytest.raises(IntegrityError) as exc_info:
+            session.commit()
+        assert auth_routes._integrity_error_kind(exc_info.value) == "duplicate_user"
+        session.rollback()
+    
     def test_login_nonexistent_user(self, client):
         """Test that login fails for non-existent user."""
         response = client.post(
@@ -132,6 +227,32 @@ class TestLogin:
         
         # Should be 401 Unauthorized
         assert response.status_code == 401
+    
+    def test_login_upgrades_bcrypt_hash(self, client, session, test_customer):
+        """
+        Test that a legacy bcrypt hash still works and is upgraded to Argon2id.
+        
+        Users created before the switch keep their bcrypt hashes until they
+        next log in successfully.
+        """
+        # Arrange - give the customer an old-style bcrypt hash
+        test_customer.hashed_password = bcrypt.hash("CustomerPass123!")
+        session.add(test_customer)
+        session.commit()
+        
+        # Act
+        response = client.post(
+            "/auth/token",
+            json={
+                "username": test_customer.username,
+                "password": "CustomerPass123!",
+            }
+        )
+        
+        # Assert
+        assert response.status_code == 200
+        session.refresh(test_customer)
+        assert test_customer.hashed_password.startswith("$argon2id$")
 
 
 class TestProtectedEndpoints:
@@ -148,17 +269,9 @@ class TestProtectedEndpoints:
         
         assert response.status_code == 401
     
-    def test_get_me_with_auth(self, client, test_customer):
+    def test_get_me_with_auth(self, client, login, test_customer):
         """Test that /auth/me works when logged in."""
-        # First, log in via /auth/token
-        login_response = client.post(
-            "/auth/token",
-            json={
-                "username": test_customer.username,
-                "password": "CustomerPass123!",
-            }
-        )
-        assert login_response.status_code == 200, f"Login failed: {login_response.json()}"
+        login(test_customer)
         
         # Now access protected endpoint (cookies are automatically sent)
         response = client.get("/auth/me")
@@ -166,18 +279,15 @@ class TestProtectedEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["username"] == test_customer.username
+        # The endpoint bypasses response_model, so check nothing extra leaks
+        assert set(data) == {
+            "id", "username", "email", "first_name", "last_name", "role", "email_verified"
+        }
+        assert data["role"] == "customer"
     
-    def test_logout(self, client, test_customer):
+    def test_logout(self, client, login, test_customer):
         """Test that logout clears the auth cookie."""
-        # Log in first via /auth/token
-        login_response = client.post(
-            "/auth/token",
-            json={
-                "username": test_customer.username,
-                "password": "CustomerPass123!",
-            }
-        )
-        assert login_response.status_code == 200
+        login(test_customer)
         
         # Verify we're logged in
         assert client.get("/auth/me").status_code == 200
@@ -188,3 +298,130 @@ class TestProtectedEndpoints:
         
         # Verify we're logged out
         assert client.get("/auth/me").status_code == 401
+    
+    def test_tampered_token_rejected_after_valid_one(self, client, login, test_customer):
+        """
+        Test that a cached verification only covers the exact token.
+        
+        The valid token is verified (and cached) first; a modified copy
+        must still go through full verification and fail.
+        """
+        token = login(test_customer).cookies["access_token"]
+        assert client.get("/auth/me").status_code == 200
+        
+        client.cookies.clear()
+        response = client.get("/auth/me", headers={"Authorization": f"Bearer {token[:-2]}xx"})
+        
+        assert response.status_code == 401
+
+    
+    def test_old_token_rejected_after_username_reused(self, client, login, session, test_customer):
+        """
+        Test that a token only ever resolves to the account it was issued for.
+        
+        The user cache is keyed by username: if the account is deleted and
+        the username re-registered, the old token must not pick up the new
+        account's cached row.
+        """
+        login(test_customer)
+        assert client.get("/auth/me").status_code == 200
+        
+        old_id = test_customer.id
+        session.delete(test_customer)
+        session.commit()
+        session.add(User(
+            # A fresh id, as PostgreSQL's sequence would give (SQLite reuses the old one)
+            id=old_id + 100,
+            first_name="New",
+            last_name="Owner",
+            username=test_customer.username,
+            email="new-owner@example.com",
+            hashed_password=hash_password("NewOwnerPass123!"),
+            role=SystemRole.CUSTOMER,
+        ))
+        session.commit()
+        new_client = TestClient(app)
+        login(test_customer, "NewOwnerPass123!", client=new_client)
+        assert new_client.get("/auth/me").json()["email"] == "new-owner@example.com"
+        
+        response = client.get("/auth/me")
+        
+        assert response.status_code == 401
+
+    
+    def test_cached_user_is_not_shared_between_requests(self, session, test_customer):
+        """
+        Test that each request gets its own current_user object.
+        
+        The second call is served from the user cache; changing the first
+        request's object must not show up in it.
+        """
+        token = create_access_token({"sub": test_customer.username, "uid": test_customer.id})
+        
+        first = get_current_user(token, session)
+        first.role = SystemRole.SUPERADMIN
+        second = get_current_user(token, session)
+        
+        assert second is not first
+        assert second.role == SystemRole.CUSTOMER
+
+
+class TestEmailLinks:
+    """Tests for the email verification and password reset endpoints."""
+    
+    def test_verify_email(self, client, login, session, test_customer):
+        """Test that a verification link marks the email verified, once."""
+        test_customer.email_verified = False
+        session.add(test_customer)
+        session.commit()
+        login(test_customer)
+        assert client.get("/auth/me").json()["email_verified"] is False
+        token = create_email_verification_token(test_customer.email)
+        
+        response = client.post("/auth/verify-email", json={"token": token})
+        
+        assert response.status_code == 200
+        assert response.json()["message"].startswith("Email verified")
+        # The cached current user is dropped, so /me sees the change at once
+        assert client.get("/auth/me").json()["email_verified"] is True
+        # Using the link again reports it is already verified
+        response = client.post("/auth/verify-email", json={"token": token})
+        assert response.json()["message"].startswith("Email is already verified")
+    
+    def test_verify_email_unknown_user(self, client):
+        """Test that a valid link for a missing account is rejected."""
+        token = create_email_verification_token("nobody@example.com")
+        
+        response = client.post("/auth/verify-email", json={"token": token})
+        
+        assert response.status_code == 400
+    
+    def test_forgot_password_throttled_per_address(self, client, test_customer, monkeypatch):
+        """Test that repeated reset requests for one address send one email."""
+        sent = []
+        monkeypatch.setattr(
+            "app.routes.auth_routes.send_password_reset_email",
+            lambda email, token: sent.append(email)
+        )
+        
+        for _ in range(3):
+            response = client.post("/auth/forgot-password", json={"email": test_customer.email})
+            assert response.status_code == 200
+        
+        assert sent == [test_customer.email]
+    
+    def test_reset_password(self, client, login, test_customer):
+        """Test that a reset link sets a new password that can log in."""
+        # Log in first so the user's row is cached
+        login(test_customer)
+        assert client.get("/auth/me").status_code == 200
+        token = create_password_reset_token(test_customer.email)
+        
+        response = client.post(
+            "/auth/reset-password",
+            json={"token": token, "new_password": "NewPass456!"}
+        )
+        
+        assert response.status_code == 200
+        assert test_customer.username not in auth._user_cache
+        login(test_customer, "NewPass456!")
@@ -18,24 +18,24 @@ Each transition has rules:
 - etc.
 """
 
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from app.models.enums import OrderStatus
+from app.models.order import Order
 
 
 class TestCreateOrder:
     """Tests for order creation."""
     
-    def test_create_order_success(self, client, test_customer, test_restaurant, test_recipe):
+    def test_create_order_success(self, client, login, test_customer, test_restaurant, test_recipe):
         """
         Test that a logged-in customer can place an order.
         
         This is the "happy path" for the order flow.
         """
         # Log in as customer
-        client.post(
-            "/auth/token",
-            json={"username": test_customer.username, "password": "CustomerPass123!"}
-        )
+        login(test_customer)
         
         # Create order
         order_data = {
@@ -71,12 +71,9 @@ class TestCreateOrder:
         
         assert response.status_code == 401
     
-    def test_create_order_invalid_restaurant(self, client, test_customer, test_recipe):
+    def test_create_order_invalid_restaurant(self, client, login, test_customer, test_recipe):
         """Test that creating an order for non-existent restaurant fails."""
-        client.post(
-            "/auth/token",
-            json={"username": test_customer.username, "password": "CustomerPass123!"}
-        )
+        login(test_customer)
         
         order_data = {
             "restaurant_id": 99999,  # Doesn't exist
@@ -87,12 +84,9 @@ class TestCreateOrder:
         
         assert response.status_code == 404
     
-    def test_create_order_empty_items(self, client, test_customer, test_restaurant):
+    def test_create_order_empty_items(self, client, login, test_customer, test_restaurant):
         """Test that creating an order with no items fails."""
-        client.post(
-            "/auth/token",
-            json={"username": test_customer.username, "password": "CustomerPass123!"}
-        )
+        login(test_customer)
         
         order_data = {
             "restaurant_id": test_restaurant.id,
@@ -103,13 +97,31 @@ class TestCreateOrder:
         
         # Should fail - can't have an order with no items
         assert response.status_code in [400, 422]
+    
+    def test_create_order_unknown_recipes(self, client, login, test_customer, test_restaurant, test_recipe):
+        """Test that every recipe missing from the restaurant is reported at once."""
+        login(test_customer)
+        
+        order_data = {
+            "restaurant_id": test_restaurant.id,
+            "items": [
+                {"recipe_id": 99998, "quantity": 1},
+                {"recipe_id": test_recipe.id, "quantity": 1},
+                {"recipe_id": 99999, "quantity": 1},
+            ],
+        }
+        
+        response = client.post("/orders/", json=order_data)
+        
+        assert response.status_code == 400
+        assert response.json()["detail"].endswith("99998, 99999")
 
 
 class TestOrderStatusTransitions:
     """Tests for order status updates."""
     
     def test_restaurant_can_update_to_preparing(
-        self, client, session, test_owner, test_restaurant, test_customer, test_recipe
+        self, client, login, session, test_owner, test_restaurant, test_customer, test_recipe
     ):
         """
         Test that restaurant owner can mark a PAID order as PREPARING.
@@ -117,10 +129,7 @@ class TestOrderStatusTransitions:
         This simulates: Customer pays → Restaurant starts cooking
         """
         # First, create an order as customer
-        client.post(
-            "/auth/token",
-            json={"username": test_customer.username, "password": "CustomerPass123!"}
-        )
+        login(test_customer)
         
         order_response = client.post("/orders/", json={
             "restaurant_id": test_restaurant.id,
@@ -137,10 +146,7 @@ class TestOrderStatusTransitions:
         session.commit()
         
         # Now log in as restaurant owner
-        client.post(
-            "/auth/token",
-            json={"username": test_owner.username, "password": "OwnerPass123!"}
-        )
+        login(test_owner)
         
         # Update status to PREPARING
         response = client.put(
@@ -152,7 +158,7 @@ class TestOrderStatusTransitions:
         assert response.json()["status"] == "preparing"
     
     def test_cannot_skip_status(
-        self, client, session, test_owner, test_restaurant, test_customer, test_recipe
+        self, client, login, session, test_owner, test_restaurant, test_customer, test_recipe
     ):
         """
         Test that you can't skip statuses (e.g., PENDING → READY).
@@ -160,10 +166,7 @@ class TestOrderStatusTransitions:
         Order must follow the proper flow.
         """
         # Create order as customer
-        client.post(
-            "/auth/token",
-            json={"username": test_customer.username, "password": "CustomerPass123!"}
-        )
+        login(test_customer)
         
         order_response = client.post("/orders/", json={
             "restaurant_id": test_restaurant.id,
@@ -172,10 +175,7 @@ class TestOrderStatusTransitions:
         order_id = order_response.json()["id"]
         
         # Log in as owner
-        client.post(
-            "/auth/token",
-            json={"username": test_owner.username, "password": "OwnerPass123!"}
-        )
+        login(test_owner)
         
         # Try to skip from PENDING directly to READY (should fail)
         response = client.put(
@@ -191,13 +191,10 @@ class TestOrderAccess:
     """Tests for order access control."""
     
     def test_customer_can_view_own_orders(
-        self, client, test_customer, test_restaurant, test_recipe
+        self, client, login, test_customer, test_restaurant, test_recipe
     ):
         """Test that customers can see their own orders."""
-        client.post(
-            "/auth/token",
-            json={"username": test_customer.username, "password": "CustomerPass123!"}
-        )
+        login(test_customer)
         
         # Create an order
         client.post("/orders/", json={
@@ -213,8 +210,76 @@ class TestOrderAccess:
         assert len(orders) == 1
         assert orders[0]["customer_id"] == test_customer.id
     
+    def test_customer_orders_paginated(self, client, login, session, test_customer, test_restaurant):
+        """Test that limit/cursor page through orders newest first."""
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        for day in range(3):
+            session.add(Order(
+                customer_id=test_customer.id,
+                restaurant_id=test_restaurant.id,
+                created_at=start + timedelta(days=day),
+            ))
+        session.commit()
+        login(test_customer)
+        
+        first_page = client.get("/orders/", params={"limit": 2}).json()
+        last = first_page[-1]
+        second_page = client.get(
+            "/orders/", params={"limit": 2, "cursor": last["created_at"], "cursor_id": last["id"]}
+        ).json()
+        
+        days = [order["created_at"][:10] for order in first_page + second_page]
+        assert days == ["2026-01-03", "2026-01-02", "2026-01-01"]
+    
+    def test_customer_orders_unbounded_by_default(self, client, login, session, test_customer, test_restaurant):
+        """Test that without `limit` the whole order history comes back (the orders page doesn't page)."""
+        session.add_all(
+            Order(customer_id=test_customer.id, restaurant_id=test_restaurant.id)
+            for _ in range(105)
+        )
+        session.commit()
+        login(test_customer)
+        
+        response = client.get("/orders/")
+        
+        assert response.status_code == 200
+        assert len(response.json()) == 105
+    
+    def test_customer_orders_paginated_with_tied_timestamps(self, client, login, session, test_customer, test_restaurant):
+        """
+        Test that orders sharing a created_at aren't skipped between pages.
+        
+        now() is per transaction, so ties happen; the id in the cursor
+        breaks them.
+        """
+        created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        orders = [
+            Order(customer_id=test_customer.id, restaurant_id=test_restaurant.id, created_at=created_at)
+            for _ in range(3)
+        ]
+        session.add_all(orders)
+        session.commit()
+        login(test_customer)
+        
+        first_page = client.get("/orders/", params={"limit": 2}).json()
+        last = first_page[-1]
+        second_page = client.get(
+            "/orders/", params={"limit": 2, "cursor": last["created_at"], "cursor_id": last["id"]}
+        ).json()
+        
+        ids = [order["id"] for order in first_page + second_page]
+        assert ids == sorted((order.id for order in orders), reverse=True)
+    
+    def test_cursor_requires_cursor_id(self, client, login, test_customer):
+        """Test that a created_at cursor without its id is rejected."""
+        login(test_customer)
+        
+        response = client.get("/orders/", params={"cursor": "2026-01-01T00:00:00Z"})
+        
+        assert response.status_code == 400
+    
     def test_customer_cannot_view_others_orders(
-        self, client, session, test_customer, test_restaurant, test_recipe
+        self, client, login, session, test_customer, test_restaurant, test_recipe
     ):
         """
         Test that customers cannot see other customers' orders.
@@ -239,20 +304,14 @@ class TestOrderAccess:
         session.refresh(other_customer)
         
         # Log in as first customer and create an order
-        client.post(
-            "/auth/token",
-            json={"username": test_customer.username, "password": "CustomerPass123!"}
-        )
+        login(test_customer)
         client.post("/orders/", json={
             "restaurant_id": test_restaurant.id,
             "items": [{"recipe_id": test_recipe.id, "quantity": 1}],
         })
         
         # Log in as OTHER customer
-        client.post(
-            "/auth/token",
-            json={"username": "other_customer", "password": "OtherPass123!"}
-        )
+        login(other_customer, "OtherPass123!")
         
         # Try to get orders - should only see own (none)
         response = client.get("/orders/")
@@ -266,13 +325,10 @@ class TestCancelOrder:
     """Tests for order cancellation."""
     
     def test_customer_can_cancel_pending_order(
-        self, client, test_customer, test_restaurant, test_recipe
+        self, client, login, test_customer, test_restaurant, test_recipe
     ):
         """Test that customers can cancel their pending orders."""
-        client.post(
-            "/auth/token",
-            json={"username": test_customer.username, "password": "CustomerPass123!"}
-        )
+        login(test_customer)
         
         # Create order
         order_response = client.post("/orders/", json={
@@ -291,7 +347,7 @@ class TestCancelOrder:
         assert response.json()["status"] == "cancelled"
     
     def test_cannot_cancel_preparing_order(
-        self, client, session, test_customer, test_owner, test_restaurant, test_recipe
+        self, client, login, session, test_customer, test_owner, test_restaurant, test_recipe
     ):
         """
         Test that orders being prepared cannot be cancelled.
@@ -299,10 +355,7 @@ class TestCancelOrder:
         Business rule: Once kitchen starts cooking, it's too late to cancel.
         """
         # Create order as customer
-        client.post(
-            "/auth/token",
-            json={"username": test_customer.username, "password": "CustomerPass123!"}
-        )
+        login(test_customer)
         
         order_response = client.post("/orders/", json={
             "restaurant_id": test_restaurant.id,
@@ -0,0 +1,145 @@
+"""
+Payment Webhook Tests
+
+These tests verify how the Stripe webhook handles events:
+- A checkout.session.completed event marks the order as PAID
+- A retried delivery of the same event is acknowledged but not re-processed
+- The customer is notified once their order is paid
+- Unsigned or oversized requests are rejected before any processing
+- Failed payments are logged
+
+Stripe signs every webhook, so the tests sign their payloads the same way
+(HMAC-SHA256 of "timestamp.payload" with the webhook secret).
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import time
+
+import pytest
+
+from app.models.enums import OrderStatus
+from app.models.order import Order
+from app.models.webhook_event import ProcessedWebhookEvent
+from app.routes import payment_routes
+
+WEBHOOK_SECRET = "whsec_test_secret"
+
+
+def post_stripe_event(client, event: dict):
+    """Send an event to /payments/webhook with a valid Stripe signature."""
+    payload = json.dumps(event)
+    timestamp = int(time.time())
+    signature = hmac.new(
+        WEBHOOK_SECRET.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256
+    ).hexdigest()
+    return client.post(
+        "/payments/webhook",
+        content=payload,
+        headers={"stripe-signature": f"t={timestamp},v1={signature}"},
+    )
+
+
+@pytest.fixture(autouse=True)
+def webhook_secret(monkeypatch):
+    """Use a known signing secret for every test in this module."""
+    monkeypatch.setattr(payment_routes, "WEBHOOK_SECRET", WEBHOOK_SECRET)
+
+
+class TestStripeWebhook:
+    """Tests for the Stripe webhook endpoint."""
+
+    def test_checkout_completed_is_processed_once(
+        self, client, session, test_customer, test_restaurant
+    ):
+        """A retried event is acknowledged as a duplicate and not processed again."""
+        order = Order(customer_id=test_customer.id, restaurant_id=test_restaurant.id)
+        session.add(order)
+        session.commit()
+        event = {
+            "id": "evt_test_checkout",
+            "object": "event",
+            "type": "checkout.session.completed",
+            "data": {"object": {"object": "checkout.session", "metadata": {"order_id": str(order.id)}}},
+        }
+
+        response = post_stripe_event(client, event)
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "success"}
+        session.refresh(order)
+        assert order.status == OrderStatus.PAID
+        assert session.get(ProcessedWebhookEvent, "evt_test_checkout") is not None
+
+        # Stripe retries the same event
+        response = post_stripe_event(client, event)
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "duplicate"}
+
+    def test_checkout_completed_notifies_customer(
+        self, client, session, monkeypatch, test_customer, test_restaurant
+    ):
+        """Once the order is PAID, the customer gets a status update after the response."""
+        order = Order(customer_id=test_customer.id, restaurant_id=test_restaurant.id)
+        session.add(order)
+        session.commit()
+        notifications = []
+
+        async def record_notification(customer_id, order_read):
+            notifications.append((customer_id, order_read.id, order_read.status))
+
+        monkeypatch.setattr(payment_routes, "notify_order_status_change", record_notification)
+
+        post_stripe_event(client, {
+            "id": "evt_test_notify",
+            "object": "event",
+            "type": "checkout.session.completed",
+            "data": {"object": {"object": "checkout.session", "metadata": {"order_id": str(order.id)}}},
+        })
+
+        assert notifications == [(test_customer.id, order.id, OrderStatus.PAID)]
+
+    def test_missing_signature_rejected(self, client):
+        """Requests without a stripe-signature header are rejected."""
+        response = client.post("/payments/webhook", content=b"{}")
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Missing stripe-signature header"
+
+    def test_oversized_payload_rejected(self, client):
+        """Bodies over the size cap are refused before signature checks."""
+        payload = b"x" * (payment_routes.MAX_WEBHOOK_PAYLOAD_SIZE + 1)
+
+        response = client.post(
+            "/payments/webhook",
+            content=payload,
+            headers={"stripe-signature": "t=0,v1=bogus"},
+        )
+
+        assert response.status_code == 413
+
+    def test_payment_failed_is_logged(self, client, caplog, monkeypatch):
+        """Failed payments are logged through the "app" logger."""
+        # The running app doesn't propagate "app" records to the root logger
+        # (see configure_logging), so listen on the "app" logger itself
+        app_logger = logging.getLogger("app")
+        monkeypatch.setattr(app_logger, "propagate", False)
+        event = {
+            "id": "evt_test_failed",
+            "object": "event",
+            "type": "payment_intent.payment_failed",
+            "data": {"object": {"object": "payment_intent", "id": "pi_test_failed"}},
+        }
+
+        app_logger.addHandler(caplog.handler)
+        try:
+            with caplog.at_level("WARNING", logger="app"):
+                response = post_stripe_event(client, event)
+        finally:
+            app_logger.removeHandler(caplog.handler)
+
+        assert response.status_code == 200
+        assert "Payment failed: pi_test_failed" in caplog.text
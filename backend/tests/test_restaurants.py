@@ -0,0 +1,139 @@
+"""
+Restaurant Tests
+
+These tests verify the restaurant staff endpoints:
+- Listing a restaurant's memberships
+- Adding a member
+- Changing a member's role
+- Paging through the public restaurant list
+
+Only restaurant admins (and superadmins) may manage memberships, so these
+tests log in as test_owner, the RESTAURANT_ADMIN of test_restaurant.
+"""
+
+import pytest
+
+from app.models.enums import ApprovalStatus
+from app.models.membership import Membership, OrgRole
+from app.models.restaurant import Restaurant
+
+
+@pytest.fixture(name="employee_membership")
+def employee_membership_fixture(session, test_customer, test_restaurant):
+    """Adds test_customer to test_restaurant as an employee."""
+    membership = Membership(
+        user_id=test_customer.id,
+        restaurant_id=test_restaurant.id,
+        role=OrgRole.EMPLOYEE,
+    )
+    session.add(membership)
+    session.commit()
+    return membership
+
+
+class TestMemberships:
+    """Tests for restaurant membership endpoints."""
+
+    def test_list_memberships(self, client, login, test_owner, test_customer, test_restaurant, employee_membership):
+        """Each membership comes back with its user's email and name."""
+        login(test_owner)
+
+        response = client.get(f"/restaurants/{test_restaurant.id}/memberships")
+
+        assert response.status_code == 200
+        members = {m["user_email"]: m for m in response.json()}
+        assert members.keys() == {test_owner.email, test_customer.email}
+        assert members[test_owner.email]["role"] == "restaurant_admin"
+        assert members[test_customer.email]["role"] == "employee"
+        assert members[test_customer.email]["user_name"] == (
+            f"{test_customer.first_name} {test_customer.last_name}"
+        )
+
+    def test_add_member(self, client, login, test_owner, test_customer, test_restaurant):
+        """A user can be added by email, but only once."""
+        login(test_owner)
+        body = {"email": test_customer.email, "role": "employee"}
+
+        response = client.post(f"/restaurants/{test_restaurant.id}/memberships", json=body)
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["user_id"] == test_customer.id
+        assert data["role"] == "employee"
+
+        # Adding them again hits the unique constraint instead of a second row
+        response = client.post(f"/restaurants/{test_restaurant.id}/memberships", json=body)
+
+        assert response.status_code == 400
+
+    def test_update_membership_role(self, client, login, session, test_owner, test_customer, test_restaurant, employee_membership):
+        """Changing a role returns the updated membership with the member's details."""
+        login(test_owner)
+
+        response = client.put(
+            f"/restaurants/{test_restaurant.id}/memberships/{employee_membership.id}",
+            json={"role": "restaurant_admin"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["role"] == "restaurant_admin"
+        assert data["user_email"] == test_customer.email
+        session.refresh(employee_membership)
+        assert employee_membership.role == OrgRole.RESTAURANT_ADMIN
+
+    def test_update_unknown_membership(self, client, login, test_owner, test_restaurant):
+        """An unknown membership ID is a 404."""
+        login(test_owner)
+
+        response = client.put(
+            f"/restaurants/{test_restaurant.id}/memberships/9999",
+            json={"role": "employee"},
+        )
+
+        assert response.status_code == 404
+
+
+class TestRestaurantListing:
+    """Tests for the public restaurant list."""
+
+    def test_approved_restaurants_paginated(self, client, session, test_restaurant):
+        """limit/cursor page through approved restaurants in ID order."""
+        for name in ("Second Spot", "Third Table"):
+            session.add(Restaurant(
+                restaurant_name=name,
+                address="1 Page Street",
+                phone="555-0101",
+                cuisine_type="Fusion",
+                approval_status=ApprovalStatus.APPROVED,
+            ))
+        session.commit()
+
+        first_page = client.get("/restaurants/approved", params={"limit": 2}).json()
+        second_page = client.get(
+            "/restaurants/approved", params={"limit": 2, "cursor": first_page[-1]["id"]}
+        ).json()
+
+        assert len(first_page) == 2
+        assert [r["restaurant_name"] for r in first_page + second_page] == [
+            test_restaurant.restaurant_name, "Second Spot", "Third Table"
+        ]
+
+    def test_approved_restaurants_unbounded_by_default(self, client, session, test_restaurant):
+        """Without `limit` every approved restaurant comes back (the home page doesn't page)."""
+        session.add_all(
+            Restaurant(
+                restaurant_name=f"Spot {i}",
+                address="1 Page Street",
+                phone="555-0101",
+                cuisine_type="Fusion",
+                approval_status=ApprovalStatus.APPROVED,
+            )
+            for i in range(110)
+        )
+        session.commit()
+
+        response = client.get("/restaurants/approved")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 111